@@ -48,11 +48,16 @@ CREATE TABLE IF NOT EXISTS tasks (
 );
 
 -- Add indexes for better performance
-CREATE INDEX IF NOT EXISTS idx_tasks_user_id ON tasks(user_id);
 CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
 CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
 CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks(category);
 CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at DESC);
+-- Serves "WHERE user_id = ? ORDER BY created_at DESC LIMIT n" without a sort, and plain
+-- user_id lookups through its leading column (so no separate user_id index is kept).
+-- On an existing database, add it without blocking writes and drop the old index:
+--   CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_user_created_at ON tasks(user_id, created_at DESC);
+--   DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_user_id;
+CREATE INDEX IF NOT EXISTS idx_tasks_user_created_at ON tasks(user_id, created_at DESC);
 
 -- Add RLS for tasks
 ALTER TABLE tasks ENABLE ROW LEVEL SECURITY;
@@ -91,6 +96,7 @@ CREATE TABLE IF NOT EXISTS chat_history (
 CREATE INDEX IF NOT EXISTS idx_chat_history_user_id ON chat_history(user_id);
 CREATE INDEX IF NOT EXISTS idx_chat_history_session_id ON chat_history(session_id);
 CREATE INDEX IF NOT EXISTS idx_chat_history_created_at ON chat_history(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_chat_history_user_created_at ON chat_history(user_id, created_at DESC);
 
 -- Add RLS for chat history
 ALTER TABLE chat_history ENABLE ROW LEVEL SECURITY;
@@ -185,6 +191,13 @@ BEGIN
 END;
 $$ language 'plpgsql';
 
+-- Tables created by the backend's SQLAlchemy create_all before timestamps were stamped
+-- server-side have no column defaults. Add them once (not at app startup: each ALTER
+-- takes an ACCESS EXCLUSIVE lock on the table):
+--   ALTER TABLE tasks ALTER COLUMN created_at SET DEFAULT timezone('utc', now());
+--   ALTER TABLE tasks ALTER COLUMN updated_at SET DEFAULT timezone('utc', now());
+--   ALTER TABLE chat_history ALTER COLUMN created_at SET DEFAULT timezone('utc', now());
+
 -- Add triggers for updated_at
 CREATE TRIGGER update_users_updated_at BEFORE UPDATE ON users
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
@@ -1,11 +1,13 @@
+import asyncio
 import logging
 import time
 import uvicorn
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 
 # Import routes and config
 from routes.chat import router as chat_router
@@ -35,10 +37,18 @@ async def lifespan(app: FastAPI):
     logger.info(f"Debug mode: {settings.debug}")
     logger.info(f"Upload directory: {settings.upload_dir}")
     
+    # Supabase calls run in the default executor via asyncio.to_thread; size it for concurrent requests
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=settings.io_thread_pool_size))
+    
+    # Connect once here so database calls on the request path never initialize
+    await database_service.initialize_connections()
+    logger.info(f"Database backend: {database_service.connection_type}")
+    
     yield
     
     # Shutdown
     logger.info(f"Shutting down {settings.app_name}")
+    await database_service.close()
 
 # Create FastAPI application
 app = FastAPI(
@@ -47,6 +57,7 @@ app = FastAPI(
     description="AI-powered task assistant with multimodal capabilities",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -57,6 +68,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    max_age=86400,  # let browsers cache preflights for a day instead of 10 minutes
 )
 
 # Middleware for request logging and timing
@@ -64,6 +76,8 @@ app.add_middleware(
 async def log_requests(request: Request, call_next):
     """Log incoming requests and response times"""
     start_time = time.time()
+    # Shared per-request clock for downstream checks (e.g. token expiry)
+    request.state.now = start_time
     
     # Log incoming request
     logger.info(
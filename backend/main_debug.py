@@ -108,6 +108,10 @@ async def lifespan(app: FastAPI):
     logger.info(f"Routers loaded: {routers_loaded}")
     logger.info(f"CORS origins: {get_cors_origins()}")
     
+    if services_loaded.get('database'):
+        await database_service.initialize_connections()
+        logger.info(f"Database backend: {database_service.connection_type}")
+    
     yield
     
     # Shutdown
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import Dict, Any, Optional
 from datetime import datetime
 from services.monitoring import api_monitor
@@ -104,4 +104,13 @@ async def get_rate_limits():
         }
     except Exception as e:
         logger.error(f"Error getting rate limits: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get rate limits") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to get rate limits") 
+
+@router.get("/prometheus")
+async def get_prometheus_metrics():
+    """Expose API counters in Prometheus text format"""
+    try:
+        return Response(content=api_monitor.render_prometheus(), media_type="text/plain; version=0.0.4")
+    except Exception as e:
+        logger.error(f"Error rendering Prometheus metrics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to render metrics")
@@ -217,7 +217,7 @@ Remember: You're here to make users more productive and organized. Always think
         Returns:
             Dict[str, Any]: Processing results with analysis and metadata
         """
-        tracker = await track_huggingface_call("image_processing")
+        tracker = track_huggingface_call("image_processing")
         async with tracker:
             try:
                 logger.info(f"Processing image: {image_path} with task type: {task_type}")
@@ -480,7 +480,7 @@ At the end of your response, encourage the user to use the Chat feature for furt
             audio_path (str): Path to the audio file
             include_chat_direction (bool): Whether to add chat direction to the response
         """
-        tracker = await track_huggingface_call("whisper/speech-to-text")
+        tracker = track_huggingface_call("whisper/speech-to-text")
         async with tracker:
             start_time = time.time()
             
@@ -1020,7 +1020,7 @@ Please provide a comprehensive response that addresses all the input types and r
         Returns:
             Dict[str, Any]: AI response with metadata and extracted tasks
         """
-        tracker = await track_groq_call("chat/completions")
+        tracker = track_groq_call("chat/completions")
         async with tracker:
             try:
                 logger.info(f"Generating AI response for prompt length: {len(prompt)}")
@@ -1,7 +1,9 @@
 import logging
 import jwt
 import time
-from typing import Dict, Any, Optional, List
+import asyncio
+import functools
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 from fastapi import HTTPException, Request, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -13,9 +15,17 @@ logger = logging.getLogger(__name__)
 class SupabaseAuthService:
     def __init__(self):
         self.supabase: Optional[Client] = None
-        self.jwt_secret = None
+        self.jwt_secret: Optional[bytes] = None
+        self.jwks_url: Optional[str] = None
+        self._jwks_client: Optional[jwt.PyJWKClient] = None
         self.initialized = False
         
+        # Memoize RS256 signing keys by key id so the JWKS endpoint is not hit per request
+        self._signing_key_for_kid = functools.lru_cache(maxsize=8)(self._fetch_signing_key)
+        
+        # In-flight token verifications, so concurrent requests with the same token share one lookup
+        self._inflight: Dict[str, asyncio.Task] = {}
+        
         # Initialize Supabase client
         if settings.supabase_url and settings.supabase_anon_key:
             try:
@@ -23,13 +33,59 @@ class SupabaseAuthService:
                     settings.supabase_url, 
                     settings.supabase_anon_key
                 )
-                self.jwt_secret = settings.supabase_anon_key  # Used for JWT verification
+                # HS256 secret, pre-encoded once instead of on every decode
+                self.jwt_secret = settings.supabase_anon_key.encode("utf-8")
+                # Newer Supabase projects sign with RS256 keys published here
+                self.jwks_url = f"{settings.supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json"
                 self.initialized = True
                 logger.info("Supabase authentication service initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize Supabase auth service: {e}")
         else:
             logger.warning("Supabase authentication not configured - auth features disabled")
+        
+        # Bind the unavailable handler once instead of checking initialized in every method
+        if not self.initialized:
+            self.sign_up = self.sign_in = self.sign_out = self._not_available
+            self.refresh_token = self.reset_password = self.update_user = self._not_available
+            self.get_user_from_token = self._not_available
+    
+    async def _not_available(self, *args, raise_on_error: bool = True, **kwargs) -> None:
+        """Stand-in for every public method when Supabase auth is not configured"""
+        if not raise_on_error:
+            return None
+        raise HTTPException(
+            status_code=503,
+            detail="Authentication service not available"
+        )
+    
+    def _get_jwks_client(self) -> jwt.PyJWKClient:
+        """Lazily create the JWKS client (keys are cached in-process for an hour)"""
+        if self._jwks_client is None:
+            self._jwks_client = jwt.PyJWKClient(self.jwks_url, cache_keys=True, lifespan=3600)
+        return self._jwks_client
+    
+    def _fetch_signing_key(self, kid: Optional[str]) -> Any:
+        """Resolve the public key for a key id from the Supabase JWKS endpoint"""
+        client = self._get_jwks_client()
+        if kid is None:
+            return client.get_signing_keys()[0].key
+        return client.get_signing_key(kid).key
+    
+    def _resolve_verification_key(self, access_token: str):
+        """
+        Pick the verification key and algorithm from the token header
+        
+        Args:
+            access_token (str): JWT access token
+            
+        Returns:
+            Tuple of (key, algorithm)
+        """
+        header = jwt.get_unverified_header(access_token)
+        if header.get("alg") == "RS256":
+            return self._signing_key_for_kid(header.get("kid")), "RS256"
+        return self.jwt_secret, "HS256"
     
     async def sign_up(self, email: str, password: str, metadata: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -43,12 +99,6 @@ class SupabaseAuthService:
         Returns:
             Dict containing user data and session info
         """
-        if not self.initialized:
-            raise HTTPException(
-                status_code=503,
-                detail="Authentication service not available"
-            )
-        
         try:
             # Sign up user with Supabase
             response = self.supabase.auth.sign_up({
@@ -104,12 +154,6 @@ class SupabaseAuthService:
         Returns:
             Dict containing user data and session info
         """
-        if not self.initialized:
-            raise HTTPException(
-                status_code=503,
-                detail="Authentication service not available"
-            )
-        
         try:
             response = self.supabase.auth.sign_in_with_password({
                 "email": email,
@@ -161,12 +205,6 @@ class SupabaseAuthService:
         Returns:
             Dict with success message
         """
-        if not self.initialized:
-            raise HTTPException(
-                status_code=503,
-                detail="Authentication service not available"
-            )
-        
         try:
             # Set the session for the current request
             self.supabase.auth.set_session(access_token, "")
@@ -195,12 +233,6 @@ class SupabaseAuthService:
         Returns:
             Dict containing new session info
         """
-        if not self.initialized:
-            raise HTTPException(
-                status_code=503,
-                detail="Authentication service not available"
-            )
-        
         try:
             response = self.supabase.auth.refresh_session(refresh_token)
             
@@ -232,71 +264,88 @@ class SupabaseAuthService:
                 detail="Token refresh failed"
             )
     
-    async def get_user_from_token(self, access_token: str) -> Dict[str, Any]:
+    async def _verify_token(self, access_token: str, now: Optional[float] = None) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Verify the token in a worker thread; the JWKS fetch and Supabase lookup are blocking calls"""
+        return await asyncio.to_thread(self._verify_token_sync, access_token, now)
+    
+    def _verify_token_sync(self, access_token: str, now: Optional[float] = None) -> Tuple[Optional[Dict[str, Any]], str]:
         """
-        Get user information from access token
+        Decode the token and load its user from Supabase
         
         Args:
             access_token (str): User's access token
+            now (float): Request start time, to avoid reading the clock again
             
         Returns:
-            Dict containing user information
+            Tuple of (user dict or None, error detail used when the user is None)
         """
-        if not self.initialized:
-            raise HTTPException(
-                status_code=503,
-                detail="Authentication service not available"
-            )
-        
+        error_detail = "Invalid token"
         try:
             # Verify and decode the JWT token
+            key, algorithm = self._resolve_verification_key(access_token)
             payload = jwt.decode(
                 access_token, 
-                self.jwt_secret, 
-                algorithms=["HS256"],
+                key, 
+                algorithms=[algorithm],
                 audience="authenticated"
             )
             
             # Check if token is expired
-            if payload.get('exp', 0) < time.time():
-                raise HTTPException(
-                    status_code=401,
-                    detail="Token expired"
-                )
-            
-            # Get user from Supabase
-            response = self.supabase.auth.get_user(access_token)
-            
-            if response.user:
-                return {
-                    "id": response.user.id,
-                    "email": response.user.email,
-                    "email_confirmed_at": response.user.email_confirmed_at,
-                    "user_metadata": response.user.user_metadata,
-                    "app_metadata": response.user.app_metadata
-                }
+            if payload.get('exp', 0) < (now or time.time()):
+                error_detail = "Token expired"
             else:
-                raise HTTPException(
-                    status_code=401,
-                    detail="Invalid token"
-                )
+                # Get user from Supabase
+                response = self.supabase.auth.get_user(access_token)
+                
+                if response.user:
+                    return {
+                        "id": response.user.id,
+                        "email": response.user.email,
+                        "email_confirmed_at": response.user.email_confirmed_at,
+                        "user_metadata": response.user.user_metadata,
+                        "app_metadata": response.user.app_metadata
+                    }, error_detail
                 
         except jwt.ExpiredSignatureError:
-            raise HTTPException(
-                status_code=401,
-                detail="Token expired"
-            )
+            error_detail = "Token expired"
         except jwt.InvalidTokenError:
-            raise HTTPException(
-                status_code=401,
-                detail="Invalid token"
-            )
+            error_detail = "Invalid token"
         except Exception as e:
             logger.error(f"Token verification error: {str(e)}")
-            raise HTTPException(
-                status_code=401,
-                detail="Token verification failed"
-            )
+            error_detail = "Token verification failed"
+        
+        return None, error_detail
+    
+    async def get_user_from_token(self, access_token: str, raise_on_error: bool = True,
+                                  now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get user information from access token
+        
+        Args:
+            access_token (str): User's access token
+            raise_on_error (bool): Raise HTTPException on failure instead of returning None
+            now (float): Request start time stashed by the timing middleware
+            
+        Returns:
+            Dict containing user information, or None on failure when raise_on_error is False
+        """
+        # Concurrent requests with the same token await one shared verification task.
+        # Each caller shields it, so a cancelled request never cancels the others.
+        verification = self._inflight.get(access_token)
+        if verification is None:
+            verification = asyncio.ensure_future(self._verify_token(access_token, now))
+            self._inflight[access_token] = verification
+            verification.add_done_callback(lambda _: self._inflight.pop(access_token, None))
+        user, error_detail = await asyncio.shield(verification)
+        
+        if user is not None:
+            return user
+        if not raise_on_error:
+            return None
+        raise HTTPException(
+            status_code=401,
+            detail=error_detail
+        )
     
     async def reset_password(self, email: str) -> Dict[str, Any]:
         """
@@ -308,12 +357,6 @@ class SupabaseAuthService:
         Returns:
             Dict with success message
         """
-        if not self.initialized:
-            raise HTTPException(
-                status_code=503,
-                detail="Authentication service not available"
-            )
-        
         try:
             response = self.supabase.auth.reset_password_email(email)
             
@@ -339,12 +382,6 @@ class SupabaseAuthService:
         Returns:
             Dict containing updated user info
         """
-        if not self.initialized:
-            raise HTTPException(
-                status_code=503,
-                detail="Authentication service not available"
-            )
-        
         try:
             # Set session for the request
             self.supabase.auth.set_session(access_token, "")
@@ -380,7 +417,7 @@ auth_service = SupabaseAuthService()
 # FastAPI security scheme
 security = HTTPBearer(auto_error=False)
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Optional[Dict[str, Any]]:
+async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> Optional[Dict[str, Any]]:
     """
     FastAPI dependency to get current authenticated user
     
@@ -390,13 +427,11 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     if not credentials:
         return None
     
-    try:
-        user = await auth_service.get_user_from_token(credentials.credentials)
-        return user
-    except HTTPException:
-        return None
+    return await auth_service.get_user_from_token(
+        credentials.credentials, raise_on_error=False, now=getattr(request.state, "now", None)
+    )
 
-async def require_auth(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
+async def require_auth(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
     """
     FastAPI dependency that requires authentication
     
@@ -412,11 +447,9 @@ async def require_auth(credentials: HTTPAuthorizationCredentials = Depends(secur
             detail="Authentication required"
         )
     
-    try:
-        user = await auth_service.get_user_from_token(credentials.credentials)
-        return user
-    except HTTPException as e:
-        raise e
+    return await auth_service.get_user_from_token(
+        credentials.credentials, now=getattr(request.state, "now", None)
+    )
 
 async def get_user_id_from_token(access_token: str) -> Optional[str]:
     """
@@ -428,11 +461,8 @@ async def get_user_id_from_token(access_token: str) -> Optional[str]:
     Returns:
         User ID if valid token, None otherwise
     """
-    try:
-        user = await auth_service.get_user_from_token(access_token)
-        return user.get("id")
-    except:
-        return None
+    user = await auth_service.get_user_from_token(access_token, raise_on_error=False)
+    return user.get("id") if user else None
 
 def extract_user_id_from_request(request: Request) -> Optional[str]:
     """
@@ -1,35 +1,73 @@
 import logging
 import time
-from typing import Dict, Any, List, Optional, Union
+from cachetools import TTLCache
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Union
 from datetime import datetime
+from collections import defaultdict
+from operator import itemgetter
 import asyncio
 
-# PostgreSQL/SQLAlchemy imports
-try:
-    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-    from sqlalchemy.orm import declarative_base, Mapped, mapped_column
-    from sqlalchemy import Column, Integer, String, Text, Float, DateTime, select, delete, update
-    from sqlalchemy.dialects.postgresql import UUID
-    import uuid
-    SQLALCHEMY_AVAILABLE = True
-except ImportError:
-    SQLALCHEMY_AVAILABLE = False
-
-# Supabase imports
-try:
-    from supabase import create_client, Client
-    SUPABASE_AVAILABLE = True
-except ImportError:
-    SUPABASE_AVAILABLE = False
-
 from config.settings import settings
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 logger = logging.getLogger(__name__)
 
+# Seconds each backend gets to prove it is reachable during initialize_connections
+CONNECT_PROBE_TIMEOUT = 5
+
+# SQLAlchemy and Supabase are heavy imports, so they are loaded on first use by
+# _load_sqlalchemy()/_load_supabase(). None means "not tried yet".
+SQLALCHEMY_AVAILABLE: Optional[bool] = None
+SUPABASE_AVAILABLE: Optional[bool] = None
+
+def _load_sqlalchemy() -> bool:
+    """Import SQLAlchemy and define the models on first use"""
+    global SQLALCHEMY_AVAILABLE
+    global create_async_engine, AsyncSession, async_sessionmaker, AsyncAdaptedQueuePool
+    global select, delete, update, insert, text
+    
+    if SQLALCHEMY_AVAILABLE is None:
+        try:
+            from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+            from sqlalchemy.pool import AsyncAdaptedQueuePool
+            from sqlalchemy import select, delete, update, insert, text
+        except ImportError:
+            SQLALCHEMY_AVAILABLE = False
+            return False
+        
+        _define_models()
+        SQLALCHEMY_AVAILABLE = True
+    
+    return SQLALCHEMY_AVAILABLE
+
+def _load_supabase() -> bool:
+    """Import the Supabase client on first use"""
+    global SUPABASE_AVAILABLE, create_client
+    
+    if SUPABASE_AVAILABLE is None:
+        try:
+            from supabase import create_client
+            SUPABASE_AVAILABLE = True
+        except ImportError:
+            SUPABASE_AVAILABLE = False
+    
+    return SUPABASE_AVAILABLE
+
 # SQLAlchemy Models
-if SQLALCHEMY_AVAILABLE:
+def _define_models():
+    """Declare the ORM models (only once SQLAlchemy has been imported)"""
+    global Base, Task, ChatHistory, USER_RECENT_INDEXES, TASK_COLUMNS, CHAT_COLUMNS
+    
+    from sqlalchemy.orm import declarative_base, Mapped, mapped_column
+    from sqlalchemy import Integer, String, Text, Float, DateTime, Index, func
+    
     Base = declarative_base()
     
+    # Timestamps are stamped by PostgreSQL (in UTC, matching the old utcnow defaults)
+    utc_now = func.timezone('utc', func.now())
+    
     class Task(Base):
         __tablename__ = "tasks"
         
@@ -39,8 +77,8 @@ if SQLALCHEMY_AVAILABLE:
         priority: Mapped[str] = mapped_column(String(20), default="medium")
         status: Mapped[str] = mapped_column(String(20), default="pending")
         user_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
-        created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-        updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+        created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utc_now)
+        updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=utc_now, onupdate=utc_now)
     
     class ChatHistory(Base):
         __tablename__ = "chat_history"
@@ -53,13 +91,37 @@ if SQLALCHEMY_AVAILABLE:
         response_time: Mapped[float] = mapped_column(Float, default=0.0)
         tokens_used: Mapped[int] = mapped_column(Integer, default=0)
         context: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-        created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+        created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utc_now)
+    
+    # Composite indexes for the "latest rows for a user" reads in get_tasks/get_chat_history
+    USER_RECENT_INDEXES = [
+        Index("idx_tasks_user_created_at", Task.user_id, Task.created_at.desc()),
+        Index("idx_chat_history_user_created_at", ChatHistory.user_id, ChatHistory.created_at.desc()),
+    ]
+    
+    # Response projections: timestamps come back as epoch seconds computed by PostgreSQL,
+    # so rows can be returned as dicts without per-row datetime conversion
+    def epoch(column):
+        return func.extract('epoch', column).cast(Float).label(column.name)
+    
+    tasks_table = Task.__table__
+    TASK_COLUMNS = [
+        *[column for column in tasks_table.c if column.name not in ('created_at', 'updated_at')],
+        epoch(tasks_table.c.created_at),
+        epoch(tasks_table.c.updated_at),
+    ]
+    chat_table = ChatHistory.__table__
+    CHAT_COLUMNS = [
+        *[column for column in chat_table.c if column.name != 'created_at'],
+        epoch(chat_table.c.created_at),
+    ]
 
 class DatabaseService:
     def __init__(self):
         self.engine = None
         self.async_session = None
-        self.supabase: Optional[Client] = None
+        self.supabase: Optional["Client"] = None
+        self._tasks_tbl = self._chat_tbl = self._users_tbl = self._files_tbl = None
         self.connection_type = "none"
         
         # In-memory storage fallback
@@ -71,25 +133,106 @@ class DatabaseService:
         }
         self.next_id = 1
         self.initialized = False
+        
+        # Memory lists are appended in creation order; per-user shards avoid filtering on read
+        self._tasks_by_user: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._chat_by_user: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._tasks_by_id: Dict[int, Dict[str, Any]] = {}
+        
+        # Short-lived read caches, invalidated on writes
+        self._tasks_cache = TTLCache(maxsize=1024, ttl=5)
+        self._chat_cache = TTLCache(maxsize=1024, ttl=5)
+        
+        # Last successful Supabase probe; health checks within 30s of it skip the HTTP call
+        self._supabase_last_ok = 0.0
+        
+        # (checked_at, connection_type, result) of the last health check
+        self._last_health: Optional[tuple] = None
+        
+        # Dedicated asyncpg connection receiving cache invalidations from other workers
+        self._listener_conn = None
+        
+        # PostgreSQL chat writes are queued and inserted in batches by _chat_flusher
+        # (None in the queue tells the flusher to stop)
+        self._chat_write_q: asyncio.Queue = asyncio.Queue()
+        self._chat_flush_task: Optional[asyncio.Task] = None
     
     async def initialize_connections(self):
         """Initialize database connections in order of preference"""
         
-        # 1. Try PostgreSQL direct connection first
-        if await self._try_postgresql():
-            return
+        # Probe PostgreSQL and Supabase concurrently so startup costs the slower probe, not both,
+        # but pick by priority rather than by speed so every worker settles on the same store
+        # (_try_postgresql bounds only its reachability check by CONNECT_PROBE_TIMEOUT)
+        pg_probe = asyncio.create_task(self._try_postgresql())
+        supabase_probe = asyncio.create_task(self._probe(self._try_supabase()))
         
-        # 2. Try Supabase as fallback
-        if await self._try_supabase():
-            return
+        # 1. PostgreSQL direct connection whenever it comes up
+        if await pg_probe:
+            supabase_probe.cancel()
+            connection_type = "postgresql"
+        # 2. Otherwise Supabase
+        elif await supabase_probe:
+            connection_type = "supabase"
+        else:
+            connection_type = "memory"
+        
+        if connection_type != "postgresql":
+            await self._discard_postgresql()
         
-        # 3. Use in-memory storage
-        logger.warning("No database connection available - using in-memory storage")
-        self.connection_type = "memory"
+        if connection_type == "postgresql":
+            # Slow setup only once PostgreSQL is chosen, outside any probe timeout
+            await self._warm_pool(settings.db_pool_size or 20)
+            await self._start_cache_listener()
+            self._chat_flush_task = asyncio.create_task(self._chat_flusher())
+        elif connection_type == "memory":
+            # 3. Use in-memory storage
+            logger.warning("No database connection available - using in-memory storage")
+        
+        self.connection_type = connection_type
+        self.initialized = True
+    
+    async def close(self):
+        """Write any queued chat messages, stop the flusher and release database connections"""
+        flusher = self._chat_flush_task
+        if flusher is not None:
+            if not flusher.done():
+                # The stop marker queues behind pending messages, so the flusher writes them first
+                self._chat_write_q.put_nowait(None)
+                await asyncio.wait({flusher})
+            if not flusher.cancelled() and flusher.exception() is not None:
+                logger.error(f"Chat write flusher stopped with an error: {flusher.exception()}")
+            self._chat_flush_task = None
+        await self._discard_postgresql()
+        
+        # Back to the unconnected state so later calls don't queue writes nobody will flush
+        self.connection_type = "none"
+        self.initialized = False
+    
+    async def _probe(self, attempt) -> bool:
+        """Run one connection attempt, treating a timeout as failure"""
+        try:
+            return await asyncio.wait_for(attempt, timeout=CONNECT_PROBE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Database connection attempt timed out after {CONNECT_PROBE_TIMEOUT}s")
+            return False
+    
+    async def _discard_postgresql(self):
+        """Release anything a losing or cancelled PostgreSQL attempt left behind"""
+        if self._listener_conn is not None:
+            await self._listener_conn.close()
+            self._listener_conn = None
+        if self.engine is not None:
+            await self.engine.dispose()
+            self.engine = None
+            self.async_session = None
+    
+    async def _run(self, query):
+        """Execute a blocking supabase-py query in a worker thread so the event loop stays free"""
+        return await asyncio.to_thread(query.execute)
     
     async def _try_postgresql(self) -> bool:
         """Try to connect to PostgreSQL directly"""
-        if not SQLALCHEMY_AVAILABLE:
+        if not _load_sqlalchemy():
             logger.warning("SQLAlchemy not available - cannot use PostgreSQL direct connection")
             return False
         
@@ -106,12 +249,19 @@ class DatabaseService:
                 logger.error("Invalid database URL format. Must start with postgresql://")
                 return False
             
-            # Create async engine
+            # Create async engine with an explicitly sized pool
+            pool_size = settings.db_pool_size or 20
             self.engine = create_async_engine(
                 db_url,
                 echo=settings.debug,
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=pool_size,
+                max_overflow=settings.db_max_overflow or 20,
+                pool_timeout=30,
                 pool_pre_ping=True,
-                pool_recycle=3600
+                pool_recycle=3600,
+                # Larger asyncpg server-side and SQLAlchemy-side prepared statement caches
+                connect_args={"statement_cache_size": 1024, "prepared_statement_cache_size": 1024}
             )
             
             # Create session factory
@@ -121,28 +271,76 @@ class DatabaseService:
                 expire_on_commit=False
             )
             
-            # Test connection
+            # Test connection: connect + SELECT 1 is the only step held to the probe timeout
+            await asyncio.wait_for(self._ping(), timeout=CONNECT_PROBE_TIMEOUT)
+            
+            # Schema setup can take a while on a cold database; it is not a reachability signal
             async with self.engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
-            
-            # Test a simple query
-            async with self.async_session() as session:
-                result = await session.execute(select(Task).limit(1))
-                result.fetchall()
+                # create_all skips existing tables, so add the indexes to older databases too
+                # (timestamp defaults for those tables are a one-off step in database_schema.sql)
+                for index in USER_RECENT_INDEXES:
+                    await conn.run_sync(index.create, checkfirst=True)
             
             self.connection_type = "postgresql"
             logger.info("PostgreSQL connection established successfully")
             return True
             
+        except asyncio.TimeoutError:
+            logger.warning(f"PostgreSQL did not answer SELECT 1 within {CONNECT_PROBE_TIMEOUT}s")
+            await self.engine.dispose()
+            self.engine = None
+            self.async_session = None
+            return False
         except Exception as e:
             logger.error(f"Failed to connect to PostgreSQL: {e}")
             self.engine = None
             self.async_session = None
             return False
     
+    async def _ping(self):
+        """Open a pooled connection and run SELECT 1"""
+        async with self.async_session() as session:
+            await session.execute(text("SELECT 1"))
+    
+    async def _warm_pool(self, size: int):
+        """Open pool connections up front so the first requests don't pay for connect"""
+        try:
+            connections = await asyncio.gather(*(self.engine.connect().start() for _ in range(size)))
+            await asyncio.gather(*(conn.close() for conn in connections))
+            logger.info(f"Warmed PostgreSQL pool with {size} connections")
+        except Exception as e:
+            logger.warning(f"PostgreSQL pool warmup incomplete: {e}")
+    
+    async def _start_cache_listener(self):
+        """LISTEN for writes made by other workers so their read caches stay coherent with ours"""
+        try:
+            import asyncpg
+            dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+            self._listener_conn = await asyncpg.connect(dsn)
+            await self._listener_conn.add_listener("task_change", self._on_cache_notification)
+            await self._listener_conn.add_listener("chat_change", self._on_cache_notification)
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener unavailable, relying on TTL only: {e}")
+            self._listener_conn = None
+    
+    def _on_cache_notification(self, connection, pid, channel, payload):
+        """asyncpg listener callback; an empty payload means the affected user is unknown"""
+        if channel == "task_change":
+            self._invalidate_tasks(payload or None)
+        else:
+            self._invalidate_chat(payload or None)
+    
+    async def _notify(self, session, channel: str, user_id: Optional[str] = None):
+        """Queue a NOTIFY that is delivered when the surrounding transaction commits"""
+        await session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": channel, "payload": user_id or ""}
+        )
+    
     async def _try_supabase(self) -> bool:
         """Try to connect to Supabase"""
-        if not SUPABASE_AVAILABLE:
+        if not _load_supabase():
             logger.warning("Supabase client not available")
             return False
         
@@ -159,8 +357,14 @@ class DatabaseService:
                 settings.supabase_anon_key
             )
             
+            # Table request builders are stateless in supabase-py v2, so build them once
+            self._tasks_tbl = self.supabase.table('tasks')
+            self._chat_tbl = self.supabase.table('chat_history')
+            self._users_tbl = self.supabase.table('users')
+            self._files_tbl = self.supabase.table('uploaded_files')
+            
             # Test connection
-            test_result = self.supabase.table('tasks').select('count').limit(1).execute()
+            test_result = await self._run(self._tasks_tbl.select('count').limit(1))
             
             self.connection_type = "supabase"
             logger.info("Supabase connection established successfully")
@@ -172,12 +376,22 @@ class DatabaseService:
             return False
 
     async def health_check(self) -> Dict[str, Any]:
-        """Check database connection health"""
+        """Check database connection health (memoized for 5 seconds)"""
+        now = time.time()
+        if (self._last_health and now - self._last_health[0] < 5.0
+                and self._last_health[1] == self.connection_type):
+            return self._last_health[2]
+        
+        result = await self._check_health()
+        self._last_health = (now, self.connection_type, result)
+        return result
+    
+    async def _check_health(self) -> Dict[str, Any]:
+        """Probe the active backend"""
         if self.connection_type == "postgresql":
             try:
                 async with self.async_session() as session:
-                    result = await session.execute(select(Task).limit(1))
-                    result.fetchall()
+                    await session.execute(text("SELECT 1"))
                 return {
                     "status": "connected",
                     "type": "postgresql",
@@ -194,7 +408,9 @@ class DatabaseService:
         
         elif self.connection_type == "supabase":
             try:
-                result = self.supabase.table('tasks').select('count').limit(1).execute()
+                if time.time() - self._supabase_last_ok >= 30:
+                    await self._run(self._tasks_tbl.select('id').limit(1))
+                    self._supabase_last_ok = time.time()
                 return {
                     "status": "connected",
                     "type": "supabase",
@@ -222,54 +438,81 @@ class DatabaseService:
     # TASKS OPERATIONS
     # ==========================================
     
+    @staticmethod
+    def _rebuild_user_shard(shards: Dict[str, List[Dict[str, Any]]], rows: List[Dict[str, Any]],
+                            user_id: Optional[str]):
+        """Recompute one user's shard from the full memory list, preserving creation order"""
+        if not user_id:
+            return
+        shard = [row for row in rows if row.get('user_id') == user_id]
+        if shard:
+            shards[user_id] = shard
+        else:
+            shards.pop(user_id, None)
+    
+    def _invalidate_tasks(self, user_id: Optional[str] = None):
+        """Drop cached task lists affected by a write (everything if the user is unknown)"""
+        if user_id is None:
+            self._tasks_cache.clear()
+        else:
+            self._tasks_cache.pop((user_id,), None)
+            self._tasks_cache.pop((None,), None)
+    
+    def _invalidate_chat(self, user_id: Optional[str] = None):
+        """Drop cached chat history pages affected by a write (everything if the user is unknown)"""
+        if user_id is None:
+            self._chat_cache.clear()
+            return
+        for key in [key for key in self._chat_cache.keys() if key[0] in (user_id, None)]:
+            self._chat_cache.pop(key, None)
+    
     async def get_tasks(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all tasks, optionally filtered by user"""
+        cache_key = (user_id,)
+        cached = self._tasks_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
+        # Cached as a tuple and handed out as fresh lists, so callers can't alter the cache
+        tasks = await self._fetch_tasks(user_id)
+        self._tasks_cache[cache_key] = tuple(tasks)
+        return tasks
+    
+    async def _fetch_tasks(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Load tasks from the active backend"""
         
         if self.connection_type == "postgresql":
             try:
                 async with self.async_session() as session:
-                    query = select(Task).order_by(Task.created_at.desc())
+                    # Core select on the table: plain row mappings, no ORM hydration.
+                    # Epoch seconds are computed by PostgreSQL, so rows need no conversion.
+                    columns = Task.__table__.c
+                    query = select(*TASK_COLUMNS).order_by(columns.created_at.desc()).execution_options(yield_per=1000)
                     if user_id:
-                        query = query.where(Task.user_id == user_id)
+                        query = query.where(columns.user_id == user_id)
                     
-                    result = await session.execute(query)
-                    tasks = result.scalars().all()
-                    
-                    return [
-                        {
-                            "id": task.id,
-                            "summary": task.summary,
-                            "category": task.category,
-                            "priority": task.priority,
-                            "status": task.status,
-                            "user_id": task.user_id,
-                            "created_at": task.created_at.timestamp(),
-                            "updated_at": task.updated_at.timestamp()
-                        }
-                        for task in tasks
-                    ]
+                    # Stream in chunks of 1000 rows rather than buffering the whole result first
+                    result = await session.stream(query)
+                    return [dict(row) async for row in result.mappings()]
             except Exception as e:
                 logger.error(f"Failed to fetch tasks from PostgreSQL: {e}")
                 return []
         
         elif self.connection_type == "supabase":
             try:
-                query = self.supabase.table('tasks').select('*').order('created_at', desc=True)
+                query = self._tasks_tbl.select('*').order('created_at', desc=True)
                 if user_id:
                     query = query.eq('user_id', user_id)
-                result = query.execute()
+                result = await self._run(query)
                 return result.data if result.data else []
             except Exception as e:
                 logger.error(f"Failed to fetch tasks from Supabase: {e}")
                 return []
         
         else:
-            # Memory storage
-            tasks = self.memory_storage['tasks']
-            if user_id:
-                tasks = [task for task in tasks if task.get('user_id') == user_id]
-            tasks.sort(key=lambda x: x.get('created_at', 0), reverse=True)
-            return tasks
+            # Memory storage (kept in creation order, so newest-first is a reversed copy)
+            tasks = self._tasks_by_user.get(user_id, []) if user_id else self.memory_storage['tasks']
+            return tasks[::-1]
 
     async def create_task(self, task_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Create a new task"""
@@ -277,30 +520,24 @@ class DatabaseService:
         if self.connection_type == "postgresql":
             try:
                 async with self.async_session() as session:
-                    task = Task(
+                    # INSERT ... RETURNING loads generated columns in the same round-trip
+                    stmt = insert(Task.__table__).values(
                         summary=task_data.get('summary', ''),
                         category=task_data.get('category', 'general'),
                         priority=task_data.get('priority', 'medium'),
                         status=task_data.get('status', 'pending'),
                         user_id=task_data.get('user_id')
-                    )
+                    ).returning(*TASK_COLUMNS)
                     
-                    session.add(task)
+                    result = await session.execute(stmt)
+                    task = dict(result.mappings().one())
+                    await self._notify(session, "task_change", task['user_id'])
                     await session.commit()
-                    await session.refresh(task)
+                    self._invalidate_tasks(task['user_id'])
                     
-                    logger.info(f"Created task in PostgreSQL: {task.id} - {task.summary[:50]}")
+                    logger.info(f"Created task in PostgreSQL: {task['id']} - {task['summary'][:50]}")
                     
-                    return {
-                        "id": task.id,
-                        "summary": task.summary,
-                        "category": task.category,
-                        "priority": task.priority,
-                        "status": task.status,
-                        "user_id": task.user_id,
-                        "created_at": task.created_at.timestamp(),
-                        "updated_at": task.updated_at.timestamp()
-                    }
+                    return task
             except Exception as e:
                 logger.error(f"Failed to create task in PostgreSQL: {e}")
                 return None
@@ -310,7 +547,8 @@ class DatabaseService:
                 if 'created_at' not in task_data:
                     task_data['created_at'] = time.time()
                 
-                result = self.supabase.table('tasks').insert(task_data).execute()
+                result = await self._run(self._tasks_tbl.insert(task_data))
+                self._invalidate_tasks(task_data.get('user_id'))
                 if result.data:
                     logger.info(f"Created task in Supabase: {result.data[0].get('id')}")
                     return result.data[0]
@@ -327,27 +565,129 @@ class DatabaseService:
             task['updated_at'] = time.time()
             
             self.memory_storage['tasks'].append(task)
+            self._tasks_by_id[task['id']] = task
+            if task.get('user_id'):
+                self._tasks_by_user[task['user_id']].append(task)
             self.next_id += 1
+            self._invalidate_tasks(task.get('user_id'))
             
             logger.info(f"Created task in memory: {task['id']} - {task.get('summary', 'No summary')[:50]}")
             return task
 
+    async def create_tasks_bulk(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many tasks in a single round-trip"""
+        if not rows:
+            return []
+        
+        if self.connection_type == "postgresql":
+            try:
+                async with self.async_session() as session:
+                    values = [
+                        {
+                            "summary": row.get('summary', ''),
+                            "category": row.get('category', 'general'),
+                            "priority": row.get('priority', 'medium'),
+                            "status": row.get('status', 'pending'),
+                            "user_id": row.get('user_id')
+                        }
+                        for row in rows
+                    ]
+                    # executemany with RETURNING (batched by SQLAlchemy's insertmanyvalues)
+                    stmt = insert(Task.__table__).returning(*TASK_COLUMNS, sort_by_parameter_order=True)
+                    result = await session.execute(stmt, values)
+                    tasks = [dict(row) for row in result.mappings()]
+                    await self._notify(session, "task_change")
+                    await session.commit()
+                    self._invalidate_tasks()
+                    
+                    logger.info(f"Created {len(tasks)} tasks in PostgreSQL")
+                    
+                    return tasks
+            except Exception as e:
+                logger.error(f"Failed to bulk create tasks in PostgreSQL: {e}")
+                return []
+        
+        elif self.connection_type == "supabase":
+            try:
+                now = time.time()
+                payload = [row if 'created_at' in row else {**row, 'created_at': now} for row in rows]
+                result = await self._run(self._tasks_tbl.insert(payload))
+                self._invalidate_tasks()
+                created = result.data or []
+                logger.info(f"Created {len(created)} tasks in Supabase")
+                return created
+            except Exception as e:
+                logger.error(f"Failed to bulk create tasks in Supabase: {e}")
+                return []
+        
+        else:
+            # Memory storage
+            now = time.time()
+            tasks = []
+            for task_id, row in zip(range(self.next_id, self.next_id + len(rows)), rows):
+                task = row.copy()
+                task['id'] = task_id
+                task['created_at'] = task.get('created_at', now)
+                task['updated_at'] = now
+                tasks.append(task)
+            
+            self.memory_storage['tasks'].extend(tasks)
+            for task in tasks:
+                self._tasks_by_id[task['id']] = task
+                if task.get('user_id'):
+                    self._tasks_by_user[task['user_id']].append(task)
+            self.next_id += len(rows)
+            self._invalidate_tasks()
+            
+            logger.info(f"Created {len(tasks)} tasks in memory")
+            return tasks
+
     async def update_task(self, task_id: int, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update an existing task"""
-        if not self.initialized:
+        if self.connection_type == "postgresql":
+            try:
+                columns = Task.__table__.c
+                values = {key: value for key, value in updates.items() if key in columns and key != 'id'}
+                async with self.async_session() as session:
+                    stmt = update(Task.__table__).where(columns.id == task_id).values(**values).returning(*TASK_COLUMNS)
+                    result = await session.execute(stmt)
+                    task = result.mappings().one_or_none()
+                    await self._notify(session, "task_change")
+                    await session.commit()
+                
+                if not task:
+                    logger.warning(f"Task {task_id} not found for update")
+                    return None
+                
+                self._invalidate_tasks()
+                logger.info(f"Updated task in PostgreSQL: {task_id}")
+                return dict(task)
+            except Exception as e:
+                logger.error(f"Failed to update task in PostgreSQL: {e}")
+                return None
+        
+        if self.connection_type == "memory":
             # Use in-memory storage
-            for task in self.memory_storage['tasks']:
-                if task['id'] == task_id:
-                    task.update(updates)
-                    task['updated_at'] = time.time()
-                    logger.info(f"Updated task in memory: {task_id}")
-                    return task
-            return None
+            task = self._tasks_by_id.get(task_id)
+            if task is None:
+                return None
+            
+            previous_user_id = task.get('user_id')
+            task.update(updates)
+            task['updated_at'] = time.time()
+            if task.get('user_id') != previous_user_id:
+                self._rebuild_user_shard(self._tasks_by_user, self.memory_storage['tasks'], previous_user_id)
+                self._rebuild_user_shard(self._tasks_by_user, self.memory_storage['tasks'], task.get('user_id'))
+                self._invalidate_tasks(previous_user_id)
+            self._invalidate_tasks(task.get('user_id'))
+            logger.info(f"Updated task in memory: {task_id}")
+            return task
         
         try:
             updates['updated_at'] = time.time()
             
-            result = self.supabase.table('tasks').update(updates).eq('id', task_id).execute()
+            result = await self._run(self._tasks_tbl.update(updates).eq('id', task_id))
+            self._invalidate_tasks()
             
             if result.data:
                 logger.info(f"Updated task: {task_id}")
@@ -360,20 +700,42 @@ class DatabaseService:
 
     async def delete_task(self, task_id: int) -> bool:
         """Delete a specific task"""
-        if not self.initialized:
+        if self.connection_type == "postgresql":
+            try:
+                async with self.async_session() as session:
+                    result = await session.execute(delete(Task).where(Task.id == task_id))
+                    await self._notify(session, "task_change")
+                    await session.commit()
+                
+                deleted = result.rowcount > 0
+                if deleted:
+                    self._invalidate_tasks()
+                    logger.info(f"Deleted task from PostgreSQL: {task_id}")
+                return deleted
+            except Exception as e:
+                logger.error(f"Failed to delete task from PostgreSQL: {e}")
+                return False
+        
+        if self.connection_type == "memory":
             # Use in-memory storage
-            original_count = len(self.memory_storage['tasks'])
-            self.memory_storage['tasks'] = [
-                task for task in self.memory_storage['tasks'] 
-                if task['id'] != task_id
-            ]
-            deleted = len(self.memory_storage['tasks']) < original_count
-            if deleted:
-                logger.info(f"Deleted task from memory: {task_id}")
-            return deleted
+            task = self._tasks_by_id.pop(task_id, None)
+            if task is None:
+                return False
+            
+            self.memory_storage['tasks'].remove(task)
+            user_id = task.get('user_id')
+            if user_id:
+                shard = self._tasks_by_user[user_id]
+                shard.remove(task)
+                if not shard:
+                    del self._tasks_by_user[user_id]
+            self._invalidate_tasks(user_id)
+            logger.info(f"Deleted task from memory: {task_id}")
+            return True
         
         try:
-            result = self.supabase.table('tasks').delete().eq('id', task_id).execute()
+            result = await self._run(self._tasks_tbl.delete().eq('id', task_id))
+            self._invalidate_tasks()
             logger.info(f"Deleted task: {task_id}")
             return True
             
@@ -392,7 +754,9 @@ class DatabaseService:
                     else:
                         result = await session.execute(delete(Task))
                     
+                    await self._notify(session, "task_change", user_id)
                     await session.commit()
+                    self._invalidate_tasks(user_id)
                     count = result.rowcount
                     logger.info(f"Cleared {count} tasks from PostgreSQL")
                     return count
@@ -402,14 +766,16 @@ class DatabaseService:
         
         elif self.connection_type == "supabase":
             try:
-                query = self.supabase.table('tasks').delete()
+                # Ask PostgREST for the affected row count instead of the deleted rows themselves
+                query = self._tasks_tbl.delete(count='exact', returning='minimal')
                 if user_id:
                     query = query.eq('user_id', user_id)
                 else:
                     query = query.neq('id', 0)
                 
-                result = query.execute()
-                count = len(result.data) if result.data else 0
+                result = await self._run(query)
+                self._invalidate_tasks(user_id)
+                count = result.count or 0
                 logger.info(f"Cleared {count} tasks from Supabase")
                 return count
             except Exception as e:
@@ -424,9 +790,14 @@ class DatabaseService:
                     task for task in self.memory_storage['tasks'] 
                     if task.get('user_id') != user_id
                 ]
+                for task in self._tasks_by_user.pop(user_id, []):
+                    self._tasks_by_id.pop(task['id'], None)
             else:
                 self.memory_storage['tasks'] = []
+                self._tasks_by_user.clear()
+                self._tasks_by_id.clear()
             
+            self._invalidate_tasks(user_id)
             cleared_count = original_count - len(self.memory_storage['tasks'])
             logger.info(f"Cleared {cleared_count} tasks from memory")
             return cleared_count
@@ -439,43 +810,32 @@ class DatabaseService:
         """Save a chat message to history"""
         
         if self.connection_type == "postgresql":
-            try:
-                async with self.async_session() as session:
-                    chat = ChatHistory(
-                        user_id=message_data.get('user_id'),
-                        message=message_data.get('message', ''),
-                        response=message_data.get('response', ''),
-                        model=message_data.get('model'),
-                        response_time=message_data.get('response_time', 0.0),
-                        tokens_used=message_data.get('tokens_used', 0),
-                        context=message_data.get('context')
-                    )
-                    
-                    session.add(chat)
-                    await session.commit()
-                    await session.refresh(chat)
-                    
-                    return {
-                        "id": chat.id,
-                        "user_id": chat.user_id,
-                        "message": chat.message,
-                        "response": chat.response,
-                        "model": chat.model,
-                        "response_time": chat.response_time,
-                        "tokens_used": chat.tokens_used,
-                        "context": chat.context,
-                        "created_at": chat.created_at.timestamp()
-                    }
-            except Exception as e:
-                logger.error(f"Failed to save chat message to PostgreSQL: {e}")
-                return None
+            row = {
+                "user_id": message_data.get('user_id'),
+                "message": message_data.get('message', ''),
+                "response": message_data.get('response', ''),
+                "model": message_data.get('model'),
+                "response_time": message_data.get('response_time', 0.0),
+                "tokens_used": message_data.get('tokens_used', 0),
+                "context": message_data.get('context')
+            }
+            
+            # Resolved by _chat_flusher once the batch containing this row commits
+            saved = asyncio.get_running_loop().create_future()
+            if self._chat_flush_task is None or self._chat_flush_task.done():
+                # No flusher to hand the row to; write it on its own
+                await self._flush_chat_batch([(row, saved)])
+            else:
+                self._chat_write_q.put_nowait((row, saved))
+            return await saved
         
         elif self.connection_type == "supabase":
             try:
                 if 'created_at' not in message_data:
                     message_data['created_at'] = time.time()
                 
-                result = self.supabase.table('chat_history').insert(message_data).execute()
+                result = await self._run(self._chat_tbl.insert(message_data))
+                self._invalidate_chat(message_data.get('user_id'))
                 if result.data:
                     return result.data[0]
                 return None
@@ -490,28 +850,110 @@ class DatabaseService:
             message['created_at'] = message.get('created_at', time.time())
             
             self.memory_storage['chat_history'].append(message)
+            if message.get('user_id'):
+                self._chat_by_user[message['user_id']].append(message)
             self.next_id += 1
+            self._invalidate_chat(message.get('user_id'))
             
             return message
 
+    async def _chat_flusher(self):
+        """Insert queued chat messages in batches of up to 100, waiting at most 50ms to fill a batch"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        batch: List[tuple] = []
+        try:
+            while not stopping:
+                item = await self._chat_write_q.get()
+                if item is None:  # close() was called and everything before it is written
+                    return
+                batch = [item]
+                deadline = loop.time() + 0.05
+                while len(batch) < 100:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._chat_write_q.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                await self._flush_chat_batch(batch)
+        finally:
+            # Whether stopped, cancelled or crashed, no caller may be left waiting
+            queue = self._chat_write_q
+            pending = batch + [queue.get_nowait() for _ in range(queue.qsize())]
+            for item in pending:
+                if item is not None and not item[1].done():
+                    item[1].set_result(None)
+    
+    async def _flush_chat_batch(self, batch: List[tuple]):
+        """Write one batch with a single executemany and resolve each caller's future"""
+        rows = [row for row, _ in batch]
+        try:
+            async with self.async_session() as session:
+                stmt = insert(ChatHistory.__table__).returning(*CHAT_COLUMNS, sort_by_parameter_order=True)
+                result = await session.execute(stmt, rows)
+                chats = [dict(row) for row in result.mappings()]
+                for user_id in {row['user_id'] for row in rows}:
+                    await self._notify(session, "chat_change", user_id)
+                await session.commit()
+            
+            for user_id in {row['user_id'] for row in rows}:
+                self._invalidate_chat(user_id)
+            
+            for (_, saved), chat in zip(batch, chats):
+                if not saved.done():
+                    saved.set_result(chat)
+        except Exception as e:
+            logger.error(f"Failed to save {len(batch)} chat messages to PostgreSQL: {e}")
+            for _, saved in batch:
+                if not saved.done():
+                    saved.set_result(None)
+    
     async def get_chat_history(self, user_id: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
         """Get chat history, optionally filtered by user"""
-        if not self.initialized:
+        cache_key = (user_id, limit)
+        cached = self._chat_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
+        history = await self._fetch_chat_history(user_id, limit)
+        self._chat_cache[cache_key] = tuple(history)
+        return history
+    
+    async def _fetch_chat_history(self, user_id: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Load chat history from the active backend"""
+        if self.connection_type == "postgresql":
+            try:
+                columns = ChatHistory.__table__.c
+                query = select(*CHAT_COLUMNS).order_by(columns.created_at.desc()).limit(limit)
+                if user_id:
+                    query = query.where(columns.user_id == user_id)
+                
+                async with self.async_session() as session:
+                    rows = (await session.execute(query)).mappings().all()
+                return [dict(row) for row in rows]
+            except Exception as e:
+                logger.error(f"Failed to fetch chat history from PostgreSQL: {e}")
+                return []
+        
+        if self.connection_type == "memory":
             # Use in-memory storage
-            history = self.memory_storage['chat_history']
-            if user_id:
-                history = [msg for msg in history if msg.get('user_id') == user_id]
-            # Sort by created_at descending and limit
-            history.sort(key=lambda x: x.get('created_at', 0), reverse=True)
-            return history[:limit]
+            history = self._chat_by_user.get(user_id, []) if user_id else self.memory_storage['chat_history']
+            # Newest first: take the tail and reverse it instead of sorting
+            return history[-limit:][::-1] if limit > 0 else []
         
         try:
-            query = self.supabase.table('chat_history').select('*').order('created_at', desc=True).limit(limit)
+            query = self._chat_tbl.select('*').order('created_at', desc=True).limit(limit)
             
             if user_id:
                 query = query.eq('user_id', user_id)
             
-            result = query.execute()
+            result = await self._run(query)
             return result.data if result.data else []
             
         except Exception as e:
@@ -520,7 +962,25 @@ class DatabaseService:
 
     async def clear_chat_history(self, user_id: Optional[str] = None) -> int:
         """Clear chat history, optionally for a specific user"""
-        if not self.initialized:
+        if self.connection_type == "postgresql":
+            try:
+                async with self.async_session() as session:
+                    query = delete(ChatHistory)
+                    if user_id:
+                        query = query.where(ChatHistory.user_id == user_id)
+                    result = await session.execute(query)
+                    await self._notify(session, "chat_change", user_id)
+                    await session.commit()
+                
+                self._invalidate_chat(user_id)
+                count = result.rowcount
+                logger.info(f"Cleared {count} chat messages from PostgreSQL")
+                return count
+            except Exception as e:
+                logger.error(f"Failed to clear chat history from PostgreSQL: {e}")
+                return 0
+        
+        if self.connection_type == "memory":
             # Use in-memory storage
             original_count = len(self.memory_storage['chat_history'])
             
@@ -529,23 +989,27 @@ class DatabaseService:
                     msg for msg in self.memory_storage['chat_history'] 
                     if msg.get('user_id') != user_id
                 ]
+                self._chat_by_user.pop(user_id, None)
             else:
                 self.memory_storage['chat_history'] = []
+                self._chat_by_user.clear()
             
+            self._invalidate_chat(user_id)
             cleared_count = original_count - len(self.memory_storage['chat_history'])
             logger.info(f"Cleared {cleared_count} chat messages from memory")
             return cleared_count
         
         try:
-            query = self.supabase.table('chat_history').delete()
+            query = self._chat_tbl.delete(count='exact', returning='minimal')
             
             if user_id:
                 query = query.eq('user_id', user_id)
             else:
                 query = query.neq('id', 0)  # Clear all
             
-            result = query.execute()
-            count = len(result.data) if result.data else 0
+            result = await self._run(query)
+            self._invalidate_chat(user_id)
+            count = result.count or 0
             logger.info(f"Cleared {count} chat messages")
             return count
             
@@ -559,7 +1023,8 @@ class DatabaseService:
     
     async def create_or_get_user(self, user_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Create a new user or get existing user"""
-        if not self.initialized:
+        # There is no ORM model for users, so PostgreSQL deployments keep them in memory
+        if self.connection_type != "supabase":
             # Use in-memory storage
             # First try to get existing user
             if 'email' in user_data:
@@ -581,7 +1046,7 @@ class DatabaseService:
         try:
             # First try to get existing user
             if 'email' in user_data:
-                existing = self.supabase.table('users').select('*').eq('email', user_data['email']).execute()
+                existing = await self._run(self._users_tbl.select('*').eq('email', user_data['email']))
                 if existing.data:
                     return existing.data[0]
             
@@ -589,7 +1054,7 @@ class DatabaseService:
             if 'created_at' not in user_data:
                 user_data['created_at'] = time.time()
             
-            result = self.supabase.table('users').insert(user_data).execute()
+            result = await self._run(self._users_tbl.insert(user_data))
             
             if result.data:
                 logger.info(f"Created user: {result.data[0].get('id')}")
@@ -606,7 +1071,8 @@ class DatabaseService:
     
     async def save_uploaded_file(self, file_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Save file upload record"""
-        if not self.initialized:
+        # There is no ORM model for uploaded files, so PostgreSQL deployments keep them in memory
+        if self.connection_type != "supabase":
             # Use in-memory storage
             file_record = file_data.copy()
             file_record['id'] = self.next_id
@@ -622,7 +1088,7 @@ class DatabaseService:
             if 'created_at' not in file_data:
                 file_data['created_at'] = time.time()
             
-            result = self.supabase.table('uploaded_files').insert(file_data).execute()
+            result = await self._run(self._files_tbl.insert(file_data))
             
             if result.data:
                 return result.data[0]
@@ -634,22 +1100,21 @@ class DatabaseService:
 
     async def get_uploaded_files(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get file upload records"""
-        if not self.initialized:
+        if self.connection_type != "supabase":
             # Use in-memory storage
             files = self.memory_storage['uploaded_files']
             if user_id:
                 files = [file for file in files if file.get('user_id') == user_id]
-            # Sort by created_at descending
-            files.sort(key=lambda x: x.get('created_at', 0), reverse=True)
-            return files
+            # Sort a copy by created_at descending; the shared list keeps insertion order
+            return sorted(files, key=itemgetter('created_at'), reverse=True)
         
         try:
-            query = self.supabase.table('uploaded_files').select('*').order('created_at', desc=True)
+            query = self._files_tbl.select('*').order('created_at', desc=True)
             
             if user_id:
                 query = query.eq('user_id', user_id)
             
-            result = query.execute()
+            result = await self._run(query)
             return result.data if result.data else []
             
         except Exception as e:
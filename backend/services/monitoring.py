@@ -1,19 +1,48 @@
 import time
+import bisect
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from collections import deque
+from enum import IntEnum
+from typing import Dict, Any, List, Optional, NamedTuple, Iterator, Tuple, Union
+from datetime import datetime
 from dataclasses import dataclass, asdict
-from collections import defaultdict, deque
-import json
+from array import array
 import os
+import aiofiles
 
 logger = logging.getLogger(__name__)
 
-@dataclass
-class APIMetric:
+class Service(IntEnum):
+    """Monitored services, doubling as slots in the per-service counter arrays"""
+    GROQ = 0
+    HUGGINGFACE = 1
+    SUPABASE = 2
+
+SERVICE_IDX = {service.name.lower(): service for service in Service}
+SERVICE_NAMES = tuple(SERVICE_IDX)
+N_SERVICES = len(Service)
+RECENT_WINDOW = 100
+STATUS_NAMES = ('unknown', 'healthy', 'degraded', 'down')
+STATUS_HEALTHY = 1
+METRICS_CAPACITY = 10000
+EXPORT_BATCH_BYTES = 64 * 1024
+TRACKER_POOL_SIZE = 256
+MAX_ERR_LEN = 512
+INTAKE_BATCH = 256
+
+# Free list of finished trackers, reused by APIMonitor.track_api_call
+_tracker_pool: List['APICallTracker'] = []
+
+def _clip_error(message: Optional[str]) -> Optional[str]:
+    """Bound stored error messages to MAX_ERR_LEN characters"""
+    if message is None or len(message) <= MAX_ERR_LEN:
+        return message
+    return message[:MAX_ERR_LEN - 3] + '...'
+
+class APIMetric(NamedTuple):
     """Individual API call metric"""
-    timestamp: datetime
+    timestamp: float  # epoch seconds
     service: str  # 'groq', 'huggingface', 'supabase'
     endpoint: str
     method: str
@@ -36,79 +65,283 @@ class ServiceHealth:
     total_requests: int
     error_count: int
 
+class MetricRing:
+    """Fixed-size columnar ring buffer of API metrics"""
+    
+    __slots__ = ('capacity', 'head', 'size', 'services', 'ts', 'svc', 'status', 'rt',
+                 'req_sz', 'resp_sz', 'endpoint', 'method', 'err', 'uid')
+    
+    def __init__(self, capacity: int = METRICS_CAPACITY):
+        self.capacity = capacity
+        self.head = 0
+        self.size = 0
+        self.services = list(SERVICE_NAMES)
+        self.ts = array('d', [0.0] * capacity)  # epoch seconds
+        self.svc = array('B', [0] * capacity)
+        self.status = array('H', [0] * capacity)
+        self.rt = array('d', [0.0] * capacity)
+        self.req_sz = array('Q', [0] * capacity)
+        self.resp_sz = array('Q', [0] * capacity)
+        self.endpoint: List[Optional[str]] = [None] * capacity
+        self.method: List[Optional[str]] = [None] * capacity
+        self.err: List[Optional[str]] = [None] * capacity
+        self.uid: List[Optional[str]] = [None] * capacity
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def service_id(self, service: str) -> int:
+        """Intern a service name to its column id"""
+        i = SERVICE_IDX.get(service)
+        if i is None:
+            try:
+                i = self.services.index(service)
+            except ValueError:
+                self.services.append(service)
+                i = len(self.services) - 1
+        return i
+    
+    def append(self, ts: float, svc: int, endpoint: str, method: str, status: int,
+               rt: float, req_sz: int, resp_sz: int, err: Optional[str], uid: Optional[str]):
+        """Write one metric at the head, overwriting the oldest when full"""
+        h = self.head
+        self.ts[h] = ts
+        self.svc[h] = svc
+        self.status[h] = status
+        self.rt[h] = rt
+        self.req_sz[h] = req_sz
+        self.resp_sz[h] = resp_sz
+        self.endpoint[h] = endpoint
+        self.method[h] = method
+        self.err[h] = err
+        self.uid[h] = uid
+        h += 1
+        self.head = h if h < self.capacity else 0
+        if self.size < self.capacity:
+            self.size += 1
+    
+    def segments_since(self, cutoff: float) -> List[Tuple[int, int]]:
+        """Contiguous (lo, hi) slot ranges with ts >= cutoff, oldest first"""
+        # Slots are written in time order, so each contiguous half is sorted
+        start = (self.head - self.size) % self.capacity
+        end = start + self.size
+        if end <= self.capacity:
+            return [(bisect.bisect_left(self.ts, cutoff, start, end), end)]
+        wrapped = end - self.capacity
+        if self.ts[0] < cutoff:
+            return [(bisect.bisect_left(self.ts, cutoff, 0, wrapped), wrapped)]
+        return [(bisect.bisect_left(self.ts, cutoff, start, self.capacity), self.capacity), (0, wrapped)]
+    
+    def rows_since(self, cutoff: float) -> Iterator[Dict[str, Any]]:
+        """Materialize metric dicts with ts >= cutoff, oldest first"""
+        services = self.services
+        fromtimestamp = datetime.fromtimestamp
+        for lo, hi in self.segments_since(cutoff):
+            # Column slices are copied up front and walked together in one pass
+            columns = zip(self.ts[lo:hi], self.svc[lo:hi], self.endpoint[lo:hi], self.method[lo:hi],
+                          self.status[lo:hi], self.rt[lo:hi], self.req_sz[lo:hi],
+                          self.resp_sz[lo:hi], self.err[lo:hi], self.uid[lo:hi])
+            for ts, svc, endpoint, method, status, rt, req_sz, resp_sz, err, uid in columns:
+                yield {
+                    'timestamp': fromtimestamp(ts).isoformat(),
+                    'service': services[svc],
+                    'endpoint': endpoint,
+                    'method': method,
+                    'status_code': status,
+                    'response_time': rt,
+                    'request_size': req_sz,
+                    'response_size': resp_sz,
+                    'error_message': err,
+                    'user_id': uid
+                }
+
 class APIMonitor:
     """Comprehensive API monitoring and metrics collection"""
     
     def __init__(self):
-        self.metrics: deque = deque(maxlen=10000)  # Keep last 10k metrics
-        self.service_stats = defaultdict(lambda: {
-            'total_requests': 0,
-            'total_errors': 0,
-            'total_response_time': 0,
-            'last_success': None,
-            'last_failure': None,
-            'recent_response_times': deque(maxlen=100)
-        })
-        self.rate_limits = {
-            'groq': {'requests_per_minute': 30, 'current_count': 0, 'reset_time': datetime.now()},
-            'huggingface': {'requests_per_minute': 1000, 'current_count': 0, 'reset_time': datetime.now()},
-            'supabase': {'requests_per_minute': 1000, 'current_count': 0, 'reset_time': datetime.now()}
-        }
+        self.metrics = MetricRing(METRICS_CAPACITY)  # Keep last 10k metrics
+        n = N_SERVICES
+        self.req = array('Q', [0] * n)
+        self.err = array('Q', [0] * n)
+        self.rt_sum = array('d', [0.0] * n)
+        self.last_success = array('d', [0.0] * n)  # epoch seconds, 0.0 = never
+        self.last_failure = array('d', [0.0] * n)
+        # Last RECENT_WINDOW response times per service with a running sum
+        self.rt_ring = [array('d', [0.0] * RECENT_WINDOW) for _ in range(n)]
+        self.rt_ring_sum = array('d', [0.0] * n)
+        self.rt_ring_len = array('H', [0] * n)
+        self.rt_cursor = array('H', [0] * n)
+        # Running summary maintained by _record for the dashboard
+        self.status = array('B', [0] * n)  # index into STATUS_NAMES
+        self.unhealthy = n
+        self.grand_requests = 0
+        self.grand_errors = 0
+        # Per-service rate limit windows keyed by time.monotonic() minute bucket
+        self.rl_bucket = array('q', [-1] * n)
+        self.rl_count = array('Q', [0] * n)
+        self.rl_max = array('Q', [30, 1000, 1000])
+        # Finished calls waiting to be folded into the stats by _drain_intake
+        self._intake: deque = deque()
+        self._drain_task: Optional[asyncio.Task] = None
         
-    async def track_api_call(self, service: str, endpoint: str, method: str = 'POST', 
-                           user_id: Optional[str] = None):
+    def track_api_call(self, service: Union[Service, str], endpoint: str, method: str = 'POST', 
+                       user_id: Optional[str] = None) -> 'APICallTracker':
         """Context manager for tracking API calls"""
+        if not isinstance(service, int):
+            service = self.metrics.service_id(service)
+        if _tracker_pool:
+            tracker = _tracker_pool.pop()
+            tracker._reset(self, service, endpoint, method, user_id)
+            return tracker
         return APICallTracker(self, service, endpoint, method, user_id)
     
     def record_metric(self, metric: APIMetric):
         """Record an API metric"""
-        self.metrics.append(metric)
-        
-        # Update service statistics
-        stats = self.service_stats[metric.service]
-        stats['total_requests'] += 1
-        stats['total_response_time'] += metric.response_time
-        stats['recent_response_times'].append(metric.response_time)
+        self._record(metric.timestamp, self.metrics.service_id(metric.service), metric.endpoint, metric.method,
+                     metric.status_code, metric.response_time, metric.request_size,
+                     metric.response_size, _clip_error(metric.error_message), metric.user_id)
+    
+    def _enqueue(self, item: tuple):
+        """Queue a finished call for the background drain task"""
+        self._intake.append(item)
+        if self._drain_task is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # Worker thread or no loop: only queue, so this never races a running drain
+                # task; the drain task or the next read's flush_intake() records it
+                return
+            self._drain_task = loop.create_task(self._drain_intake())
+    
+    async def _drain_intake(self):
+        """Fold queued calls into the stats in batches"""
+        try:
+            while self._intake:
+                self.flush_intake(INTAKE_BATCH)
+                await asyncio.sleep(0)
+        finally:
+            self._drain_task = None
+    
+    def flush_intake(self, limit: Optional[int] = None):
+        """Record queued calls now (all of them unless limit is given)"""
+        intake = self._intake
+        record = self._record
+        count = len(intake) if limit is None else min(limit, len(intake))
+        for _ in range(count):
+            record(*intake.popleft())
+    
+    def _record(self, ts: float, svc: int, endpoint: str, method: str, status_code: int,
+                response_time: float, request_size: int, response_size: int,
+                error_message: Optional[str], user_id: Optional[str]):
+        """Record one API call straight into the metric columns"""
+        metrics = self.metrics
+        metrics.append(ts, svc, endpoint, method, status_code, response_time,
+                       request_size, response_size, error_message, user_id)
         
-        if metric.status_code >= 400:
-            stats['total_errors'] += 1
-            stats['last_failure'] = metric.timestamp
-        else:
-            stats['last_success'] = metric.timestamp
-            
-        # Check rate limits
-        self._check_rate_limits(metric.service)
+        # Update service statistics and rate limits
+        if svc < N_SERVICES:
+            count = self._account(svc, ts, status_code, response_time)
+            if count >= self.rl_max[svc] * 0.8 and logger.isEnabledFor(logging.WARNING):
+                logger.warning("Approaching rate limit for %s: %s/%s", metrics.services[svc], count, self.rl_max[svc])
         
         # Log significant events
-        if metric.response_time > 10:  # Slow response
-            logger.warning(f"Slow API response: {metric.service} took {metric.response_time:.2f}s")
-        if metric.status_code >= 400:
-            logger.error(f"API error: {metric.service} returned {metric.status_code}: {metric.error_message}")
-    
-    def _check_rate_limits(self, service: str):
-        """Check and update rate limits"""
-        if service not in self.rate_limits:
-            return
-            
-        rate_limit = self.rate_limits[service]
-        now = datetime.now()
+        if response_time > 10 and logger.isEnabledFor(logging.WARNING):  # Slow response
+            logger.warning("Slow API response: %s took %.2fs", metrics.services[svc], response_time)
+        if status_code >= 400 and logger.isEnabledFor(logging.ERROR):
+            logger.error("API error: %s returned %s: %s", metrics.services[svc], status_code, error_message)
+    
+    def _account(self, i: int, ts: float, status_code: int, response_time: float) -> int:
+        """Numeric bookkeeping for one call to service i; returns the rate limit count"""
+        req = self.req
+        err = self.err
+        rt_sum = self.rt_sum
+        
+        total = req[i] + 1
+        req[i] = total
+        self.grand_requests += 1
+        rt_total = rt_sum[i] + response_time
+        rt_sum[i] = rt_total
         
-        # Reset counter if a minute has passed
-        if now >= rate_limit['reset_time']:
-            rate_limit['current_count'] = 0
-            rate_limit['reset_time'] = now + timedelta(minutes=1)
+        ring = self.rt_ring[i]
+        cursor = self.rt_cursor[i]
+        self.rt_ring_sum[i] += response_time - ring[cursor]
+        ring[cursor] = response_time
+        self.rt_cursor[i] = cursor + 1 if cursor + 1 < RECENT_WINDOW else 0
+        if self.rt_ring_len[i] < RECENT_WINDOW:
+            self.rt_ring_len[i] += 1
         
-        rate_limit['current_count'] += 1
+        errors = err[i]
+        if status_code >= 400:
+            errors += 1
+            err[i] = errors
+            self.grand_errors += 1
+            self.last_failure[i] = ts
+        else:
+            self.last_success[i] = ts
         
-        # Warn if approaching limit
-        if rate_limit['current_count'] >= rate_limit['requests_per_minute'] * 0.8:
-            logger.warning(f"Approaching rate limit for {service}: {rate_limit['current_count']}/{rate_limit['requests_per_minute']}")
+        # Health status from the updated counters
+        success_rate = (total - errors) / total
+        status = STATUS_HEALTHY
+        if success_rate < 0.95:
+            status = 2
+        if success_rate < 0.5 or rt_total / total > 30:
+            status = 3
+        previous = self.status[i]
+        if status != previous:
+            self.unhealthy += (status != STATUS_HEALTHY) - (previous != STATUS_HEALTHY)
+            self.status[i] = status
+        
+        # Reset the rate limit counter when a new minute bucket starts
+        bucket = int(time.monotonic() // 60)
+        if bucket != self.rl_bucket[i]:
+            self.rl_bucket[i] = bucket
+            count = 1
+        else:
+            count = self.rl_count[i] + 1
+        self.rl_count[i] = count
+        return count
+    
+    @property
+    def rate_limits(self) -> Dict[str, Dict[str, Any]]:
+        """Rate limit status per service as plain numbers"""
+        self.flush_intake()
+        now = time.monotonic()
+        bucket = int(now // 60)
+        reset_in = 60 - now % 60
+        return {
+            service: {
+                'count': self.rl_count[i] if self.rl_bucket[i] == bucket else 0,
+                'limit': self.rl_max[i],
+                'reset_in': reset_in
+            }
+            for service, i in SERVICE_IDX.items()
+        }
+    
+    def get_recent_response_time(self, service: str) -> float:
+        """Average response time over the last RECENT_WINDOW calls"""
+        self.flush_intake()
+        i = SERVICE_IDX.get(service)
+        if i is None or not self.rt_ring_len[i]:
+            return 0.0
+        return self.rt_ring_sum[i] / self.rt_ring_len[i]
+    
+    def get_response_percentile(self, service: str, percentile: float) -> float:
+        """Response time percentile (0-100) over the last RECENT_WINDOW calls"""
+        self.flush_intake()
+        i = SERVICE_IDX.get(service)
+        if i is None or not self.rt_ring_len[i]:
+            return 0.0
+        samples = sorted(self.rt_ring[i][:self.rt_ring_len[i]])
+        k = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[k]
     
     def get_service_health(self, service: str) -> ServiceHealth:
         """Get health status for a service"""
-        stats = self.service_stats[service]
+        self.flush_intake()
+        i = SERVICE_IDX.get(service)
+        total = self.req[i] if i is not None else 0
         
-        if stats['total_requests'] == 0:
+        if total == 0:
             return ServiceHealth(
                 service=service,
                 status='unknown',
@@ -120,83 +353,100 @@ class APIMonitor:
                 error_count=0
             )
         
-        success_rate = (stats['total_requests'] - stats['total_errors']) / stats['total_requests']
-        avg_response_time = stats['total_response_time'] / stats['total_requests']
-        
-        # Determine status
-        status = 'healthy'
-        if success_rate < 0.95:
-            status = 'degraded'
-        if success_rate < 0.5 or avg_response_time > 30:
-            status = 'down'
-        
+        errors = self.err[i]
         return ServiceHealth(
             service=service,
-            status=status,
-            last_success=stats['last_success'] or datetime.now(),
-            last_failure=stats['last_failure'],
-            success_rate=success_rate,
-            avg_response_time=avg_response_time,
-            total_requests=stats['total_requests'],
-            error_count=stats['total_errors']
+            status=STATUS_NAMES[self.status[i]],
+            last_success=datetime.fromtimestamp(self.last_success[i]) if self.last_success[i] else datetime.now(),
+            last_failure=datetime.fromtimestamp(self.last_failure[i]) if self.last_failure[i] else None,
+            success_rate=(total - errors) / total,
+            avg_response_time=self.rt_sum[i] / total,
+            total_requests=total,
+            error_count=errors
         )
     
     def get_dashboard_data(self) -> Dict[str, Any]:
         """Get comprehensive monitoring dashboard data"""
-        services = ['groq', 'huggingface', 'supabase']
+        self.flush_intake()
+        # Overall health assessment
+        overall_health = 'healthy'
+        if self.unhealthy >= 2:
+            overall_health = 'down'
+        elif self.unhealthy == 1:
+            overall_health = 'degraded'
         
-        dashboard = {
+        return {
             'timestamp': datetime.now().isoformat(),
-            'services': {},
-            'overall_health': 'healthy',
-            'total_requests': sum(self.service_stats[s]['total_requests'] for s in services),
-            'total_errors': sum(self.service_stats[s]['total_errors'] for s in services),
-            'rate_limits': self.rate_limits.copy()
+            'services': {service: asdict(self.get_service_health(service)) for service in SERVICE_NAMES},
+            'overall_health': overall_health,
+            'total_requests': self.grand_requests,
+            'total_errors': self.grand_errors,
+            'rate_limits': self.rate_limits
         }
-        
-        unhealthy_services = 0
-        for service in services:
-            health = self.get_service_health(service)
-            dashboard['services'][service] = asdict(health)
-            
-            if health.status != 'healthy':
-                unhealthy_services += 1
-        
-        # Overall health assessment
-        if unhealthy_services >= 2:
-            dashboard['overall_health'] = 'down'
-        elif unhealthy_services == 1:
-            dashboard['overall_health'] = 'degraded'
-        
-        return dashboard
+    
+    def render_prometheus(self) -> bytes:
+        """Render the per-service counters in Prometheus text exposition format"""
+        self.flush_intake()
+        lines = [
+            '# HELP api_requests_total Total external API calls',
+            '# TYPE api_requests_total counter'
+        ]
+        lines += [f'api_requests_total{{service="{name}"}} {self.req[i]}' for name, i in SERVICE_IDX.items()]
+        lines += ['# HELP api_errors_total External API calls that failed', '# TYPE api_errors_total counter']
+        lines += [f'api_errors_total{{service="{name}"}} {self.err[i]}' for name, i in SERVICE_IDX.items()]
+        lines += ['# HELP api_response_time_seconds_sum Total external API response time',
+                  '# TYPE api_response_time_seconds_sum counter']
+        lines += [f'api_response_time_seconds_sum{{service="{name}"}} {self.rt_sum[i]}' for name, i in SERVICE_IDX.items()]
+        return ('\n'.join(lines) + '\n').encode()
     
     def get_recent_metrics(self, minutes: int = 60) -> List[Dict]:
         """Get metrics from the last N minutes"""
-        cutoff = datetime.now() - timedelta(minutes=minutes)
-        return [
-            asdict(metric) for metric in self.metrics 
-            if metric.timestamp >= cutoff
-        ]
+        return list(self._iter_recent(minutes))
     
-    async def export_metrics(self, filepath: str):
-        """Export metrics to JSON file"""
-        data = {
+    def _iter_recent(self, minutes: int) -> Iterator[Dict[str, Any]]:
+        """Iterate metric dicts from the last N minutes, oldest first"""
+        self.flush_intake()
+        return self.metrics.rows_since(time.time() - minutes * 60)
+    
+    async def export_metrics(self, filepath: str, batch_size: int = EXPORT_BATCH_BYTES):
+        """Export metrics to JSON file, flushing every batch_size bytes"""
+        # Imported here so a deploy without orjson only loses the export, not the monitor
+        import orjson
+        
+        head = orjson.dumps({
             'export_timestamp': datetime.now().isoformat(),
-            'dashboard': self.get_dashboard_data(),
-            'recent_metrics': self.get_recent_metrics(1440)  # Last 24 hours
-        }
+            'dashboard': self.get_dashboard_data()
+        })
         
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        async with aiofiles.open(filepath, 'wb') as f:
+            # Stream rows into the recent_metrics array instead of building the full document
+            buf = bytearray(head[:-1] + b',"recent_metrics":[')
+            sep = b''
+            for row in self._iter_recent(1440):  # Last 24 hours
+                buf += sep
+                buf += orjson.dumps(row)
+                sep = b','
+                if len(buf) >= batch_size:
+                    await f.write(bytes(buf))
+                    buf.clear()
+            buf += b']}'
+            await f.write(bytes(buf))
         
-        logger.info(f"Metrics exported to {filepath}")
+        logger.info("Metrics exported to %s", filepath)
 
 class APICallTracker:
     """Context manager for tracking individual API calls"""
     
-    def __init__(self, monitor: APIMonitor, service: str, endpoint: str, 
+    __slots__ = ('monitor', 'service', 'endpoint', 'method', 'user_id', 'start_time',
+                 'request_size', 'response_size', 'status_code', 'error_message')
+    
+    def __init__(self, monitor: APIMonitor, service: int, endpoint: str, 
                  method: str, user_id: Optional[str] = None):
+        self._reset(monitor, service, endpoint, method, user_id)
+    
+    def _reset(self, monitor: APIMonitor, service: int, endpoint: str,
+               method: str, user_id: Optional[str]):
         self.monitor = monitor
         self.service = service
         self.endpoint = endpoint
@@ -208,33 +458,33 @@ class APICallTracker:
         self.status_code = 200
         self.error_message = None
     
-    async def __aenter__(self):
-        self.start_time = time.time()
+    def __enter__(self):
+        self.start_time = time.perf_counter()
         return self
     
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        response_time = time.time() - self.start_time
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        response_time = time.perf_counter() - self.start_time
         
         # Determine status and error if exception occurred
         if exc_type is not None:
             self.status_code = 500
             self.error_message = str(exc_val)
         
-        # Create and record metric
-        metric = APIMetric(
-            timestamp=datetime.now(),
-            service=self.service,
-            endpoint=self.endpoint,
-            method=self.method,
-            status_code=self.status_code,
-            response_time=response_time,
-            request_size=self.request_size,
-            response_size=self.response_size,
-            error_message=self.error_message,
-            user_id=self.user_id
-        )
+        self.monitor._enqueue((time.time(), self.service, self.endpoint, self.method,
+                               self.status_code, response_time, self.request_size,
+                               self.response_size, _clip_error(self.error_message), self.user_id))
         
-        self.monitor.record_metric(metric)
+        # Hand the tracker back for reuse; callers must not keep it past exit
+        if len(_tracker_pool) < TRACKER_POOL_SIZE:
+            self.monitor = None
+            _tracker_pool.append(self)
+    
+    # The async protocol only wraps the synchronous bookkeeping above
+    async def __aenter__(self):
+        return self.__enter__()
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return self.__exit__(exc_type, exc_val, exc_tb)
     
     def set_request_size(self, size: int):
         """Set the request payload size"""
@@ -253,11 +503,11 @@ class APICallTracker:
 api_monitor = APIMonitor()
 
 # Convenience functions
-async def track_groq_call(endpoint: str, user_id: Optional[str] = None):
-    return await api_monitor.track_api_call('groq', endpoint, 'POST', user_id)
+def track_groq_call(endpoint: str, user_id: Optional[str] = None) -> APICallTracker:
+    return api_monitor.track_api_call(Service.GROQ, endpoint, 'POST', user_id)
 
-async def track_huggingface_call(endpoint: str, user_id: Optional[str] = None):
-    return await api_monitor.track_api_call('huggingface', endpoint, 'POST', user_id)
+def track_huggingface_call(endpoint: str, user_id: Optional[str] = None) -> APICallTracker:
+    return api_monitor.track_api_call(Service.HUGGINGFACE, endpoint, 'POST', user_id)
 
-async def track_supabase_call(endpoint: str, user_id: Optional[str] = None):
-    return await api_monitor.track_api_call('supabase', endpoint, 'POST', user_id) 
\ No newline at end of file
+def track_supabase_call(endpoint: str, user_id: Optional[str] = None) -> APICallTracker:
+    return api_monitor.track_api_call(Service.SUPABASE, endpoint, 'POST', user_id) 
\ No newline at end of file
@@ -1,7 +1,10 @@
+import asyncio
 import logging
 import time
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from collections import defaultdict, OrderedDict
 
 # Load environment variables explicitly
 from dotenv import load_dotenv
@@ -11,7 +14,7 @@ load_dotenv()
 try:
     from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
     from sqlalchemy.orm import declarative_base, Mapped, mapped_column
-    from sqlalchemy import Integer, String, Text, Float, DateTime, select, delete
+    from sqlalchemy import Integer, String, Text, Float, DateTime, select, delete, insert, update, func, bindparam, Index
     SQLALCHEMY_AVAILABLE = True
 except ImportError:
     SQLALCHEMY_AVAILABLE = False
@@ -27,6 +30,87 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# copy_tasks batches at or above this size go through COPY instead of INSERT
+COPY_THRESHOLD = 100
+# Columns mapped by the Task model; list_tasks projections are limited to these
+TASK_FIELDS = frozenset(('id', 'summary', 'category', 'priority', 'status', 'user_id',
+                         'created_at', 'updated_at'))
+# Full row read by get_tasks, including the fields routes/chat.py hands to TaskModel
+TASK_SELECT_COLUMNS = ('id,summary,description,category,priority,status,user_id,'
+                       'due_date,tags,metadata,created_at,updated_at')
+# Rows per Supabase request; larger reads are paged
+SUPABASE_TASKS_LIMIT = 500
+# Default projection for list_tasks: everything but the (large) summary text
+TASK_LIST_FIELDS = ('id', 'category', 'priority', 'status', 'updated_at')
+TASK_COPY_COLUMNS = ['summary', 'category', 'priority', 'status', 'user_id']
+
+# Hot-path read SQL run straight on the asyncpg connection: Records decode in C and
+# PostgreSQL does the timestamp -> epoch conversion. ORDER BY is table-qualified so
+# it sorts on the indexed column rather than the epoch alias.
+_TASKS_SQL = (
+    "SELECT id, summary, category, priority, status, user_id, "
+    "extract(epoch FROM created_at)::float8 AS created_at, "
+    "extract(epoch FROM updated_at)::float8 AS updated_at FROM tasks"
+)
+# LIMIT NULL means no limit, so one statement serves both full lists and pages
+_FETCH_TASKS_SQL = _TASKS_SQL + " ORDER BY tasks.created_at DESC LIMIT $1 OFFSET $2"
+_FETCH_USER_TASKS_SQL = _TASKS_SQL + " WHERE user_id = $3 ORDER BY tasks.created_at DESC LIMIT $1 OFFSET $2"
+
+# Insertable task fields with their defaults, in TASK_COPY_COLUMNS order
+_TASK_DEFAULTS = {'summary': '', 'category': 'general', 'priority': 'medium', 'status': 'pending', 'user_id': None}
+
+def _build_task_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Insert values for a task: defaults overlaid with the known fields from data"""
+    return {**_TASK_DEFAULTS, **{key: value for key, value in data.items() if key in _TASK_DEFAULTS}}
+
+def _supabase_task_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Insert values for a Supabase task; user_id is only sent when it looks like a UUID"""
+    payload = _build_task_payload(data)
+    user_id = payload.pop('user_id')
+    if user_id and len(str(user_id)) > 10:  # Basic UUID length check
+        payload['user_id'] = user_id
+    return payload
+
+def _epoch(timestamp: Optional[str]) -> Optional[float]:
+    """Epoch seconds for a PostgREST ISO timestamp, matching what the other backends return"""
+    if timestamp is None:
+        return None
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+
+@lru_cache(maxsize=None)
+def _cached_supabase(url: str, key: str) -> "Client":
+    """Create the Supabase client once per (url, key) and reuse it on re-initialization"""
+    return create_client(url, key)
+
+@lru_cache(maxsize=None)
+def _cached_engine(db_url: str, echo: bool = False):
+    """Create the async engine once per URL so re-initialization reuses its pool"""
+    return create_async_engine(
+        db_url,
+        echo=echo,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_pre_ping=True,
+        pool_recycle=300,  # below managed-Postgres idle cutoffs
+        pool_timeout=30,
+        pool_use_lifo=True,
+        insertmanyvalues_page_size=1000,
+        query_cache_size=1200,
+        connect_args={
+            "statement_cache_size": 1024,
+            "prepared_statement_cache_size": 1024,
+            "command_timeout": 60,
+            # TCP keepalives let the server drop sockets a NAT/load balancer silently killed
+            "server_settings": {
+                "jit": "off",
+                "application_name": "intelliassist",
+                "tcp_keepalives_idle": "30",
+                "tcp_keepalives_interval": "10",
+                "tcp_keepalives_count": "3"
+            }
+        }
+    )
+
 # SQLAlchemy Models
 if SQLALCHEMY_AVAILABLE:
     Base = declarative_base()
@@ -40,8 +124,27 @@ if SQLALCHEMY_AVAILABLE:
         priority: Mapped[str] = mapped_column(String(20), default="medium")
         status: Mapped[str] = mapped_column(String(20), default="pending")
         user_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
-        created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-        updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+        created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+        updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Serves get_tasks(user_id): index seek in ORDER BY created_at DESC order, no sort.
+    # Same name as in database_schema.sql so create_all skips it where the schema was applied.
+    Index('idx_tasks_user_created_at', Task.user_id, Task.created_at.desc())
+    
+    # Column names an update may touch
+    _TASK_COLS = frozenset(Task.__table__.columns.keys()) - {'id'}
+    
+    # Hot statements built once so SQLAlchemy's compiled cache and asyncpg's
+    # prepared-statement cache see the same statement on every call
+    _tasks_table = Task.__table__
+    # List rows come back JSON-ready: timestamps as epoch floats computed by PostgreSQL
+    _TASK_LIST_COLUMNS = [
+        *[column for column in _tasks_table.c if column.name not in ('created_at', 'updated_at')],
+        func.extract('epoch', _tasks_table.c.created_at).cast(Float).label('created_at'),
+        func.extract('epoch', _tasks_table.c.updated_at).cast(Float).label('updated_at'),
+    ]
+    _TASK_LIST_BY_NAME = {column.name: column for column in _TASK_LIST_COLUMNS}
+    _DELETE_TASK_BY_ID = delete(_tasks_table).where(_tasks_table.c.id == bindparam('tid'))
 
 class PostgreSQLDatabaseService:
     def __init__(self):
@@ -53,15 +156,73 @@ class PostgreSQLDatabaseService:
         
         # In-memory storage fallback
         self.memory_storage = {
-            'tasks': [],
             'chat_history': [],
             'uploaded_files': [],
             'users': []
         }
         self.next_id = 1
+        # In-memory tasks indexed by id, plus a user_id -> task ids index. Both keep
+        # insertion order (the user index is a dict used as an ordered set), so while
+        # tasks arrive in created_at order a newest-first listing is just a reversal.
+        self.tasks_by_id: Dict[int, Dict[str, Any]] = {}
+        self.ids_by_user: Dict[Optional[str], Dict[int, None]] = defaultdict(dict)
+        self._memory_ordered = True
+        self._last_created_at = float('-inf')
+        
+        # get_tasks results per user_id (None = all users) as (monotonic time, tasks)
+        # (LRU-ordered, capped so per-user entries can't grow without bound)
+        self._tasks_cache: "OrderedDict[Optional[str], Tuple[float, Tuple[Dict[str, Any], ...]]]" = OrderedDict()
+        self._cache_ttl = 5.0
+        self._cache_max = 500
+        self._init_lock = asyncio.Lock()
+        self._hc_snapshot: Optional[Dict[str, Any]] = None
+        self._hc_ts = 0.0
+    
+    def _invalidate_tasks(self, user_id: Optional[str] = None):
+        """Drop cached task lists for user_id and the all-users view; None drops everything"""
+        if user_id is None:
+            self._tasks_cache.clear()
+        else:
+            self._tasks_cache.pop(user_id, None)
+            self._tasks_cache.pop(None, None)
+    
+    def _new_memory_task(self, data: Dict[str, Any], now: float) -> Dict[str, Any]:
+        """Build an in-memory task from data with the next id and timestamps, and index it"""
+        # Defaults for the insertable fields, every other key of data kept as given
+        task = {**_TASK_DEFAULTS, **data}
+        task['id'] = self.next_id
+        task['created_at'] = task.get('created_at', now)
+        task['updated_at'] = now
+        self.next_id += 1
+        self._store_task(task)
+        return task
+    
+    def _store_task(self, task: Dict[str, Any]):
+        """Add a task to the in-memory indexes"""
+        self.tasks_by_id[task['id']] = task
+        self.ids_by_user[task.get('user_id')][task['id']] = None
+        created_at = task.get('created_at', 0)
+        if created_at < self._last_created_at:
+            # A caller-supplied created_at arrived out of order; listings must sort again
+            self._memory_ordered = False
+        else:
+            self._last_created_at = created_at
     
     async def initialize_connections(self):
-        """Initialize database connections in order of preference"""
+        """Initialize database connections once; the apps call this at startup so data methods can assume readiness"""
+        if self.initialized:
+            return
+        async with self._init_lock:
+            if not self.initialized:
+                await self._connect()
+    
+    async def close(self):
+        """Release pooled PostgreSQL connections; the engine reconnects lazily if used again"""
+        if self.engine is not None:
+            await self.engine.dispose()
+    
+    async def _connect(self):
+        """Connect to the first available backend in order of preference"""
         
         # 1. Try PostgreSQL direct connection first
         if await self._try_postgresql():
@@ -101,13 +262,17 @@ class PostgreSQLDatabaseService:
         #         db_url = db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
         #     
         #     # Create async engine
-        #     self.engine = create_async_engine(db_url, echo=settings.debug)
-        #     self.async_session = async_sessionmaker(self.engine, class_=AsyncSession)
+        #     self.engine = _cached_engine(db_url)
+        #     self.async_session = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
         #     
         #     # Test connection and create tables
         #     async with self.engine.begin() as conn:
         #         await conn.run_sync(Base.metadata.create_all)
         #     
+        #     # Warm the pool so the first requests don't pay for connect
+        #     conns = await asyncio.gather(*(self.engine.connect().start() for _ in range(settings.db_pool_size)))
+        #     await asyncio.gather(*(conn.close() for conn in conns))
+        #     
         #     self.connection_type = "postgresql"
         #     logger.info("PostgreSQL connection established successfully")
         #     return True
@@ -116,6 +281,10 @@ class PostgreSQLDatabaseService:
         #     logger.error(f"Failed to connect to PostgreSQL: {e}")
         #     return False
     
+    async def _run(self, query):
+        """Execute a blocking supabase-py query in a worker thread so the event loop stays free"""
+        return await asyncio.to_thread(query.execute)
+    
     async def _try_supabase(self) -> bool:
         """Try to connect to Supabase"""
         if not SUPABASE_AVAILABLE:
@@ -128,8 +297,8 @@ class PostgreSQLDatabaseService:
         try:
             # Use service role key for write operations to bypass RLS
             service_key = settings.supabase_service_key if settings.supabase_service_key else settings.supabase_anon_key
-            self.supabase = create_client(settings.supabase_url, service_key)
-            test_result = self.supabase.table('tasks').select('count').limit(1).execute()
+            self.supabase = _cached_supabase(settings.supabase_url, service_key)
+            test_result = await self._run(self.supabase.table('tasks').select('count').limit(1))
             self.connection_type = "supabase"
             logger.info("Supabase connection established successfully")
             return True
@@ -142,123 +311,159 @@ class PostgreSQLDatabaseService:
         if not self.initialized:
             await self.initialize_connections()
         
-        return {
+        # Load balancers poll this endpoint; serve the same snapshot for up to a second
+        now = time.monotonic()
+        if self._hc_snapshot is not None and now - self._hc_ts < 1.0:
+            return self._hc_snapshot
+        
+        self._hc_snapshot = {
             "status": "connected" if self.connection_type != "memory" else "development_mode",
             "type": self.connection_type,
             "message": f"Using {self.connection_type} database",
             "timestamp": time.time(),
-            "tasks_count": len(self.memory_storage['tasks']) if self.connection_type == "memory" else None
+            "tasks_count": len(self.tasks_by_id) if self.connection_type == "memory" else None
         }
+        self._hc_ts = now
+        return self._hc_snapshot
 
-    async def get_tasks(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get all tasks"""
-        if not self.initialized:
-            await self.initialize_connections()
+    async def get_tasks(self, user_id: Optional[str] = None, limit: Optional[int] = None,
+                        offset: int = 0) -> List[Dict[str, Any]]:
+        """Get tasks newest first; limit/offset select a single page (default: all)"""
+        if limit is not None or offset:
+            # Pages are fetched server-side; only the full list is cached
+            return await self._fetch_tasks(user_id, limit, offset)
+        
+        cached = self._tasks_cache.get(user_id)
+        now = time.monotonic()
+        if cached and now - cached[0] < self._cache_ttl:
+            self._tasks_cache.move_to_end(user_id)
+            return list(cached[1])
         
+        # Cached as a tuple and handed out as fresh lists, so callers can't alter the cache
+        tasks = await self._fetch_tasks(user_id)
+        self._tasks_cache[user_id] = (now, tuple(tasks))
+        self._tasks_cache.move_to_end(user_id)
+        if len(self._tasks_cache) > self._cache_max:
+            self._tasks_cache.popitem(last=False)
+        return tasks
+    
+    async def _fetch_tasks(self, user_id: Optional[str] = None, limit: Optional[int] = None,
+                           offset: int = 0) -> List[Dict[str, Any]]:
+        """Load tasks from the active backend"""
         if self.connection_type == "postgresql":
             try:
-                async with self.async_session() as session:
-                    query = select(Task).order_by(Task.created_at.desc())
+                # Raw asyncpg fetch on a pooled connection: no SQLAlchemy result processing
+                async with self.engine.connect() as conn:
+                    raw = (await conn.get_raw_connection()).driver_connection
                     if user_id:
-                        query = query.where(Task.user_id == user_id)
-                    
-                    result = await session.execute(query)
-                    tasks = result.scalars().all()
+                        rows = await raw.fetch(_FETCH_USER_TASKS_SQL, limit, offset, user_id)
+                    else:
+                        rows = await raw.fetch(_FETCH_TASKS_SQL, limit, offset)
                     
-                    return [
-                        {
-                            "id": task.id,
-                            "summary": task.summary,
-                            "category": task.category,
-                            "priority": task.priority,
-                            "status": task.status,
-                            "user_id": task.user_id,
-                            "created_at": task.created_at.timestamp(),
-                            "updated_at": task.updated_at.timestamp()
-                        }
-                        for task in tasks
-                    ]
+                    return [dict(row) for row in rows]
             except Exception as e:
                 logger.error(f"Failed to fetch tasks from PostgreSQL: {e}")
                 return []
         
         elif self.connection_type == "supabase":
             try:
-                # Don't order by created_at since it doesn't exist in the Supabase table
-                query = self.supabase.table('tasks').select('*')
+                # Filter and order server-side; only fetch the columns callers use
+                query = self.supabase.table('tasks').select(TASK_SELECT_COLUMNS)
                 if user_id:
                     query = query.eq('user_id', user_id)
-                result = query.execute()
-                logger.info(f"Supabase query result: {result.data}")
-                return result.data if result.data else []
+                query = query.order('created_at', desc=True)
+                
+                # Read in SUPABASE_TASKS_LIMIT pages until the requested rows (or all rows) are in
+                tasks: List[Dict[str, Any]] = []
+                while limit is None or len(tasks) < limit:
+                    page_size = SUPABASE_TASKS_LIMIT if limit is None else min(limit - len(tasks), SUPABASE_TASKS_LIMIT)
+                    start = offset + len(tasks)
+                    result = await self._run(query.range(start, start + page_size - 1))
+                    page = result.data or []
+                    tasks.extend(page)
+                    if len(page) < page_size:
+                        break
+                logger.info(f"Fetched {len(tasks)} tasks from Supabase")
+                return tasks
             except Exception as e:
                 logger.error(f"Failed to fetch tasks from Supabase: {e}")
                 return []
         
         else:
             # Memory storage
-            tasks = self.memory_storage['tasks']
             if user_id:
-                tasks = [task for task in tasks if task.get('user_id') == user_id]
-            tasks.sort(key=lambda x: x.get('created_at', 0), reverse=True)
+                tasks = [self.tasks_by_id[task_id] for task_id in reversed(self.ids_by_user.get(user_id, {}))]
+            else:
+                tasks = list(reversed(self.tasks_by_id.values()))
+            if not self._memory_ordered:
+                tasks.sort(key=lambda x: x.get('created_at', 0), reverse=True)
+            if limit is not None or offset:
+                return tasks[offset:None if limit is None else offset + limit]
             return tasks
 
+    async def list_tasks(self, fields: Optional[List[str]] = None, user_id: Optional[str] = None,
+                         limit: int = 100) -> List[Dict[str, Any]]:
+        """List the newest tasks with only the requested columns"""
+        fields = [field for field in (fields or TASK_LIST_FIELDS) if field in TASK_FIELDS]
+        if not fields:
+            return []
+        
+        if self.connection_type == "postgresql":
+            try:
+                async with self.async_session() as session:
+                    query = select(*[_TASK_LIST_BY_NAME[field] for field in fields])
+                    if user_id:
+                        query = query.where(_tasks_table.c.user_id == user_id)
+                    query = query.order_by(_tasks_table.c.created_at.desc()).limit(limit)
+                    result = await session.execute(query)
+                    return [dict(row) for row in result.mappings()]
+            except Exception as e:
+                logger.error(f"Failed to list tasks from PostgreSQL: {e}")
+                return []
+        
+        elif self.connection_type == "supabase":
+            try:
+                query = self.supabase.table('tasks').select(','.join(fields))
+                if user_id:
+                    query = query.eq('user_id', user_id)
+                result = await self._run(query.order('created_at', desc=True).limit(limit))
+                return result.data if result.data else []
+            except Exception as e:
+                logger.error(f"Failed to list tasks from Supabase: {e}")
+                return []
+        
+        else:
+            # Memory storage
+            tasks = await self.get_tasks(user_id)
+            return [{field: task.get(field) for field in fields} for task in tasks[:limit]]
+
     async def create_task(self, task_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Create a new task"""
-        if not self.initialized:
-            await self.initialize_connections()
-        
         if self.connection_type == "postgresql":
             try:
                 async with self.async_session() as session:
-                    task = Task(
-                        summary=task_data.get('summary', ''),
-                        category=task_data.get('category', 'general'),
-                        priority=task_data.get('priority', 'medium'),
-                        status=task_data.get('status', 'pending'),
-                        user_id=task_data.get('user_id')
-                    )
-                    
-                    session.add(task)
+                    # INSERT ... RETURNING hands back server defaults without a refresh SELECT
+                    stmt = insert(_tasks_table).values(**_build_task_payload(task_data)).returning(*_TASK_LIST_COLUMNS)
+                    task = dict((await session.execute(stmt)).mappings().one())
                     await session.commit()
-                    await session.refresh(task)
                     
-                    logger.info(f"Created task in PostgreSQL: {task.id}")
+                    logger.info(f"Created task in PostgreSQL: {task['id']}")
+                    self._invalidate_tasks(task_data.get('user_id'))
                     
-                    return {
-                        "id": task.id,
-                        "summary": task.summary,
-                        "category": task.category,
-                        "priority": task.priority,
-                        "status": task.status,
-                        "user_id": task.user_id,
-                        "created_at": task.created_at.timestamp(),
-                        "updated_at": task.updated_at.timestamp()
-                    }
+                    return task
             except Exception as e:
                 logger.error(f"Failed to create task in PostgreSQL: {e}")
                 return None
         
         elif self.connection_type == "supabase":
             try:
-                # Include all required fields to avoid constraint violations
-                supabase_task = {
-                    "summary": task_data.get('summary', ''),
-                    "category": task_data.get('category', 'general'),
-                    "priority": task_data.get('priority', 'medium'),
-                    "status": task_data.get('status', 'pending')
-                }
-                
-                # Only add user_id if it's a valid UUID format or None
-                user_id = task_data.get('user_id')
-                if user_id and len(str(user_id)) > 10:  # Basic UUID length check
-                    supabase_task["user_id"] = user_id
-                
+                supabase_task = _supabase_task_payload(task_data)
                 logger.info(f"Creating Supabase task: {supabase_task}")
-                result = self.supabase.table('tasks').insert(supabase_task).execute()
+                result = await self._run(self.supabase.table('tasks').insert(supabase_task))
                 
                 if result.data:
                     logger.info(f"Created task in Supabase: {result.data[0].get('id')}")
+                    self._invalidate_tasks(task_data.get('user_id'))
                     # Return with all the expected fields for compatibility
                     created_task = result.data[0]
                     return {
@@ -268,54 +473,106 @@ class PostgreSQLDatabaseService:
                         "priority": task_data.get('priority', 'medium'),   # Keep for compatibility
                         "status": task_data.get('status', 'pending'),      # Keep for compatibility
                         "user_id": created_task.get('user_id'),
-                        "created_at": time.time(),
-                        "updated_at": time.time()
+                        # Column defaults generated these in the database; no client clock involved
+                        "created_at": _epoch(created_task.get('created_at')),
+                        "updated_at": _epoch(created_task.get('updated_at'))
                     }
                 return None
             except Exception as e:
                 logger.error(f"Failed to create task in Supabase: {e}")
                 # If Supabase fails, fall back to memory storage
                 logger.info("Falling back to memory storage for task creation")
-                task = task_data.copy()
-                task['id'] = self.next_id
-                task['created_at'] = task.get('created_at', time.time())
-                task['updated_at'] = time.time()
-                
-                self.memory_storage['tasks'].append(task)
-                self.next_id += 1
-                
+                task = self._new_memory_task(task_data, time.time())
                 logger.info(f"Created task in memory fallback: {task['id']}")
+                self._invalidate_tasks(task_data.get('user_id'))
                 return task
         
         else:
             # Memory storage
-            task = task_data.copy()
-            task['id'] = self.next_id
-            task['created_at'] = task.get('created_at', time.time())
-            task['updated_at'] = time.time()
-            
-            self.memory_storage['tasks'].append(task)
-            self.next_id += 1
-            
+            task = self._new_memory_task(task_data, time.time())
             logger.info(f"Created task in memory: {task['id']}")
+            self._invalidate_tasks(task_data.get('user_id'))
             return task
 
+    async def create_tasks_bulk(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many tasks in a single round-trip, returning the created tasks"""
+        if not rows:
+            return []
+        
+        if self.connection_type == "postgresql":
+            try:
+                values = [_build_task_payload(row) for row in rows]
+                async with self.async_session() as session:
+                    # executemany with RETURNING, batched into multi-row VALUES by insertmanyvalues
+                    stmt = insert(_tasks_table).returning(*_TASK_LIST_COLUMNS, sort_by_parameter_order=True)
+                    tasks = [dict(row) for row in (await session.execute(stmt, values)).mappings()]
+                    await session.commit()
+                
+                logger.info(f"Created {len(tasks)} tasks in PostgreSQL")
+                self._invalidate_tasks()
+                return tasks
+            except Exception as e:
+                logger.error(f"Failed to bulk create tasks in PostgreSQL: {e}")
+                return []
+        
+        elif self.connection_type == "supabase":
+            try:
+                # PostgREST takes the whole array in one request
+                payloads = [_supabase_task_payload(row) for row in rows]
+                result = await self._run(self.supabase.table('tasks').insert(payloads))
+                tasks = result.data or []
+                logger.info(f"Created {len(tasks)} tasks in Supabase")
+                self._invalidate_tasks()
+                return tasks
+            except Exception as e:
+                logger.error(f"Failed to bulk create tasks in Supabase: {e}")
+                return []
+        
+        else:
+            # Memory storage
+            now = time.time()
+            tasks = [self._new_memory_task(row, now) for row in rows]
+            
+            logger.info(f"Created {len(tasks)} tasks in memory")
+            self._invalidate_tasks()
+            return tasks
+    
+    async def copy_tasks(self, rows: List[Dict[str, Any]]) -> int:
+        """Load many tasks as fast as possible, returning how many were inserted"""
+        if self.connection_type != "postgresql" or len(rows) < COPY_THRESHOLD:
+            return len(await self.create_tasks_bulk(rows))
+        
+        try:
+            # COPY skips per-row statement overhead but returns no rows; timestamps come from the server defaults
+            records = [tuple(_build_task_payload(row).values()) for row in rows]
+            async with self.engine.connect() as conn:
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    'tasks', records=records, columns=TASK_COPY_COLUMNS
+                )
+                await conn.commit()
+            
+            logger.info(f"Copied {len(rows)} tasks into PostgreSQL")
+            self._invalidate_tasks()
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Failed to copy tasks into PostgreSQL: {e}")
+            return 0
+
     async def clear_all_tasks(self, user_id: Optional[str] = None) -> int:
         """Clear all tasks"""
-        if not self.initialized:
-            await self.initialize_connections()
-        
         if self.connection_type == "postgresql":
             try:
                 async with self.async_session() as session:
                     if user_id:
-                        result = await session.execute(delete(Task).where(Task.user_id == user_id))
+                        result = await session.execute(delete(_tasks_table).where(_tasks_table.c.user_id == user_id))
                     else:
-                        result = await session.execute(delete(Task))
+                        result = await session.execute(delete(_tasks_table))
                     
                     await session.commit()
                     count = result.rowcount
                     logger.info(f"Cleared {count} tasks from PostgreSQL")
+                    self._invalidate_tasks(user_id)
                     return count
             except Exception as e:
                 logger.error(f"Failed to clear tasks from PostgreSQL: {e}")
@@ -323,15 +580,17 @@ class PostgreSQLDatabaseService:
         
         elif self.connection_type == "supabase":
             try:
-                query = self.supabase.table('tasks').delete()
+                # Ask PostgREST for the row count only instead of echoing every deleted row
+                query = self.supabase.table('tasks').delete(count='exact', returning='minimal')
                 if user_id:
                     query = query.eq('user_id', user_id)
                 else:
                     query = query.neq('id', 0)
                 
-                result = query.execute()
-                count = len(result.data) if result.data else 0
+                result = await self._run(query)
+                count = result.count or 0
                 logger.info(f"Cleared {count} tasks from Supabase")
+                self._invalidate_tasks(user_id)
                 return count
             except Exception as e:
                 logger.error(f"Failed to clear tasks from Supabase: {e}")
@@ -339,65 +598,58 @@ class PostgreSQLDatabaseService:
         
         else:
             # Memory storage
-            original_count = len(self.memory_storage['tasks'])
             if user_id:
-                self.memory_storage['tasks'] = [
-                    task for task in self.memory_storage['tasks'] 
-                    if task.get('user_id') != user_id
-                ]
+                task_ids = self.ids_by_user.pop(user_id, {})
+                for task_id in task_ids:
+                    del self.tasks_by_id[task_id]
+                cleared_count = len(task_ids)
             else:
-                self.memory_storage['tasks'] = []
+                cleared_count = len(self.tasks_by_id)
+                self.tasks_by_id.clear()
+                self.ids_by_user.clear()
+                self._memory_ordered = True
+                self._last_created_at = float('-inf')
             
-            cleared_count = original_count - len(self.memory_storage['tasks'])
             logger.info(f"Cleared {cleared_count} tasks from memory")
+            self._invalidate_tasks(user_id)
             return cleared_count
 
     async def update_task(self, task_id: int, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update an existing task"""
-        if not self.initialized:
-            await self.initialize_connections()
-        
         if self.connection_type == "postgresql":
             try:
+                values = {key: value for key, value in updates.items() if key in _TASK_COLS}
+                values['updated_at'] = func.now()
                 async with self.async_session() as session:
-                    # Get the task first
-                    result = await session.execute(select(Task).where(Task.id == task_id))
-                    task = result.scalar_one_or_none()
+                    # Single Core UPDATE ... RETURNING of plain columns: no ORM entity or identity map
+                    stmt = (
+                        update(_tasks_table)
+                        .where(_tasks_table.c.id == task_id)
+                        .values(**values)
+                        .returning(*_TASK_LIST_COLUMNS)
+                    )
+                    row = (await session.execute(stmt)).mappings().one_or_none()
+                    await session.commit()
                     
-                    if not task:
+                    if not row:
                         logger.warning(f"Task {task_id} not found for update")
                         return None
                     
-                    # Update task fields
-                    for key, value in updates.items():
-                        if hasattr(task, key):
-                            setattr(task, key, value)
+                    logger.info(f"Updated task in PostgreSQL: {row['id']}")
+                    self._invalidate_tasks()
                     
-                    await session.commit()
-                    await session.refresh(task)
-                    
-                    logger.info(f"Updated task in PostgreSQL: {task.id}")
-                    
-                    return {
-                        "id": task.id,
-                        "summary": task.summary,
-                        "category": task.category,
-                        "priority": task.priority,
-                        "status": task.status,
-                        "user_id": task.user_id,
-                        "created_at": task.created_at.timestamp(),
-                        "updated_at": task.updated_at.timestamp()
-                    }
+                    return dict(row)
             except Exception as e:
                 logger.error(f"Failed to update task in PostgreSQL: {e}")
                 return None
         
         elif self.connection_type == "supabase":
             try:
-                result = self.supabase.table('tasks').update(updates).eq('id', task_id).execute()
+                result = await self._run(self.supabase.table('tasks').update(updates).eq('id', task_id))
                 
                 if result.data:
                     logger.info(f"Updated task in Supabase: {task_id}")
+                    self._invalidate_tasks()
                     updated_task = result.data[0]
                     return {
                         "id": updated_task.get('id'),
@@ -416,30 +668,37 @@ class PostgreSQLDatabaseService:
         
         else:
             # Memory storage
-            for task in self.memory_storage['tasks']:
-                if task.get('id') == task_id:
-                    task.update(updates)
-                    task['updated_at'] = time.time()
-                    logger.info(f"Updated task in memory: {task_id}")
-                    return task
+            task = self.tasks_by_id.get(task_id)
+            if task:
+                previous_user_id = task.get('user_id')
+                task.update(updates)
+                task['updated_at'] = time.time()
+                if task.get('user_id') != previous_user_id:
+                    self.ids_by_user[previous_user_id].pop(task_id, None)
+                    self.ids_by_user[task.get('user_id')][task_id] = None
+                    # Re-indexed at the end of the new user's ids, out of created_at order
+                    self._memory_ordered = False
+                if 'created_at' in updates:
+                    self._memory_ordered = False
+                logger.info(f"Updated task in memory: {task_id}")
+                self._invalidate_tasks()
+                return task
             
             logger.warning(f"Task {task_id} not found in memory storage")
             return None
 
     async def delete_task(self, task_id: int) -> bool:
         """Delete a task by ID"""
-        if not self.initialized:
-            await self.initialize_connections()
-        
         if self.connection_type == "postgresql":
             try:
                 async with self.async_session() as session:
-                    result = await session.execute(delete(Task).where(Task.id == task_id))
+                    result = await session.execute(_DELETE_TASK_BY_ID, {'tid': task_id})
                     await session.commit()
                     
                     deleted = result.rowcount > 0
                     if deleted:
                         logger.info(f"Deleted task from PostgreSQL: {task_id}")
+                        self._invalidate_tasks()
                     else:
                         logger.warning(f"Task {task_id} not found for deletion")
                     
@@ -450,11 +709,15 @@ class PostgreSQLDatabaseService:
         
         elif self.connection_type == "supabase":
             try:
-                result = self.supabase.table('tasks').delete().eq('id', task_id).execute()
+                # Count-only delete: PostgREST reports the match count without echoing the row
+                result = await self._run(
+                    self.supabase.table('tasks').delete(count='exact', returning='minimal').eq('id', task_id)
+                )
                 
-                deleted = len(result.data) > 0 if result.data else False
+                deleted = bool(result.count)
                 if deleted:
                     logger.info(f"Deleted task from Supabase: {task_id}")
+                    self._invalidate_tasks()
                 else:
                     logger.warning(f"Task {task_id} not found for deletion")
                 
@@ -465,15 +728,14 @@ class PostgreSQLDatabaseService:
         
         else:
             # Memory storage
-            original_count = len(self.memory_storage['tasks'])
-            self.memory_storage['tasks'] = [
-                task for task in self.memory_storage['tasks'] 
-                if task.get('id') != task_id
-            ]
+            task = self.tasks_by_id.pop(task_id, None)
+            if task:
+                self.ids_by_user[task.get('user_id')].pop(task_id, None)
             
-            deleted = len(self.memory_storage['tasks']) < original_count
+            deleted = task is not None
             if deleted:
                 logger.info(f"Deleted task from memory: {task_id}")
+                self._invalidate_tasks()
             else:
                 logger.warning(f"Task {task_id} not found for deletion")
             
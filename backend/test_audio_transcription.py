@@ -3,6 +3,18 @@ import httpx
 import os
 from config.settings import settings
 
+# Shared client so repeated HF probes reuse one keep-alive TLS connection
+_hf_client = None
+
+def _get_hf_client() -> httpx.AsyncClient:
+    global _hf_client
+    if _hf_client is None:
+        _hf_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=5, keepalive_expiry=30)
+        )
+    return _hf_client
+
 async def test_hf_audio_api():
     """Test HuggingFace audio transcription API"""
     
@@ -22,28 +34,28 @@ async def test_hf_audio_api():
     
     # Test with minimal audio data or just check the endpoint
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url.replace("/models", "/status"))
-            print(f"📡 HuggingFace API status: {response.status_code}")
-            
-            # If status endpoint doesn't work, try a test request
-            if response.status_code != 200:
-                # Create a minimal test request
-                test_response = await client.post(
-                    url, 
-                    headers=headers,
-                    content=b"test"  # Minimal content to test headers
-                )
-                print(f"🧪 Test API response: {test_response.status_code}")
-                if test_response.status_code == 422:
-                    print("✅ API accepts requests (422 = invalid audio format, but auth works)")
-                    return True
-                elif test_response.status_code == 401:
-                    print("❌ API key invalid")
-                    return False
-                else:
-                    print(f"📝 API response: {test_response.text[:200]}")
-            
+        client = _get_hf_client()
+        response = await client.get(url.replace("/models", "/status"))
+        print(f"📡 HuggingFace API status: {response.status_code}")
+        
+        # If status endpoint doesn't work, try a test request
+        if response.status_code != 200:
+            # Create a minimal test request
+            test_response = await client.post(
+                url, 
+                headers=headers,
+                content=b"test"  # Minimal content to test headers
+            )
+            print(f"🧪 Test API response: {test_response.status_code}")
+            if test_response.status_code == 422:
+                print("✅ API accepts requests (422 = invalid audio format, but auth works)")
+                return True
+            elif test_response.status_code == 401:
+                print("❌ API key invalid")
+                return False
+            else:
+                print(f"📝 API response: {test_response.text[:200]}")
+        
     except Exception as e:
         print(f"❌ API test failed: {e}")
         return False
@@ -54,7 +66,11 @@ async def main():
     print("🎤 Testing HuggingFace Audio Transcription API")
     print("=" * 50)
     
-    success = await test_hf_audio_api()
+    try:
+        success = await test_hf_audio_api()
+    finally:
+        if _hf_client is not None:
+            await _hf_client.aclose()
     
     if success:
         print("\n✅ Audio transcription should work!")
@@ -5,7 +5,7 @@ Tests AI service, document processing, task saving, and more
 """
 
 import asyncio
-import requests
+import httpx
 import json
 import os
 import tempfile
@@ -15,29 +15,15 @@ from pathlib import Path
 # Configuration
 API_BASE = "http://localhost:8000/api/v1"  # Change to your deployed URL if needed
 
-def create_test_files():
-    """Create sample test files for document processing"""
-    test_files = {}
-    
-    # Create temporary directory
-    temp_dir = Path("test_files")
-    temp_dir.mkdir(exist_ok=True)
-    
-    # 1. Create a sample CSV file
-    csv_content = """Name,Email,Department,Task,Priority,Status
+# Sample file payloads, written as raw bytes
+_CSV_BYTES = b"""Name,Email,Department,Task,Priority,Status
 John Doe,john@example.com,Engineering,Complete API documentation,High,Pending
 Jane Smith,jane@example.com,Marketing,Launch social media campaign,Medium,In Progress
 Bob Johnson,bob@example.com,HR,Update employee handbook,Low,Completed
 Alice Brown,alice@example.com,Finance,Prepare Q3 budget report,High,Pending
 Mike Wilson,mike@example.com,Engineering,Fix production bugs,Critical,In Progress"""
-    
-    csv_path = temp_dir / "sample_tasks.csv"
-    with open(csv_path, 'w') as f:
-        f.write(csv_content)
-    test_files['csv'] = csv_path
-    
-    # 2. Create a sample text file
-    txt_content = """Meeting Notes - Project Planning Session
+
+_TXT_BYTES = b"""Meeting Notes - Project Planning Session
 Date: 2024-01-15
 Attendees: John, Jane, Mike, Sarah
 
@@ -61,14 +47,8 @@ NEXT STEPS:
 
 URGENT: The client presentation is scheduled for next Tuesday - need to prepare slides and demo.
 """
-    
-    txt_path = temp_dir / "meeting_notes.txt"
-    with open(txt_path, 'w') as f:
-        f.write(txt_content)
-    test_files['txt'] = txt_path
-    
-    # 3. Create a sample log file
-    log_content = """2024-01-15 09:00:00 INFO: System startup completed
+
+_LOG_BYTES = b"""2024-01-15 09:00:00 INFO: System startup completed
 2024-01-15 09:05:00 WARNING: Database connection slow
 2024-01-15 09:10:00 ERROR: Failed to process user request ID:12345
 2024-01-15 09:15:00 INFO: TODO: Investigate database performance issues
@@ -78,10 +58,33 @@ URGENT: The client presentation is scheduled for next Tuesday - need to prepare
 2024-01-15 09:35:00 WARNING: Server memory usage at 85%
 2024-01-15 09:40:00 INFO: Scheduled maintenance required this weekend
 """
+
+def _write_if_changed(path, payload):
+    """Write payload unless the file already holds exactly these bytes"""
+    if not path.exists() or path.read_bytes() != payload:
+        path.write_bytes(payload)
+
+def create_test_files():
+    """Create sample test files for document processing"""
+    test_files = {}
+    
+    # Create temporary directory
+    temp_dir = Path("test_files")
+    temp_dir.mkdir(exist_ok=True)
+    
+    # 1. Create a sample CSV file
+    csv_path = temp_dir / "sample_tasks.csv"
+    _write_if_changed(csv_path, _CSV_BYTES)
+    test_files['csv'] = csv_path
+    
+    # 2. Create a sample text file
+    txt_path = temp_dir / "meeting_notes.txt"
+    _write_if_changed(txt_path, _TXT_BYTES)
+    test_files['txt'] = txt_path
     
+    # 3. Create a sample log file
     log_path = temp_dir / "system.log"
-    with open(log_path, 'w') as f:
-        f.write(log_content)
+    _write_if_changed(log_path, _LOG_BYTES)
     test_files['log'] = log_path
     
     print(f"✅ Created test files in {temp_dir}/")
@@ -93,7 +96,8 @@ async def test_system_status():
     print("=" * 50)
     
     try:
-        response = requests.get(f"{API_BASE}/status", timeout=10)
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.get(f"{API_BASE}/status")
         
         if response.status_code == 200:
             status = response.json()
@@ -131,13 +135,23 @@ async def test_file_upload_and_analysis(test_files):
     
     results = {}
     
-    for file_type, file_path in test_files.items():
+    async def _upload(client, file_path):
+        files = {'file': (file_path.name, await asyncio.to_thread(file_path.read_bytes), 'application/octet-stream')}
+        return await client.post(f"{API_BASE}/upload", files=files)
+    
+    # Upload every file concurrently, then report in order
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        responses = await asyncio.gather(
+            *[_upload(client, file_path) for file_path in test_files.values()],
+            return_exceptions=True
+        )
+    
+    for (file_type, file_path), response in zip(test_files.items(), responses):
         print(f"\n📄 Testing {file_type.upper()} file: {file_path.name}")
         
         try:
-            with open(file_path, 'rb') as f:
-                files = {'file': (file_path.name, f, 'application/octet-stream')}
-                response = requests.post(f"{API_BASE}/upload", files=files, timeout=30)
+            if isinstance(response, Exception):
+                raise response
             
             if response.status_code == 200:
                 result = response.json()
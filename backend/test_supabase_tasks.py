@@ -5,142 +5,106 @@ Run this to check if task creation, retrieval, and deletion is working
 """
 
 import asyncio
-import requests
+import httpx
 import json
+import orjson
+import logging
 import os
-from datetime import datetime
 
 # Configuration
 API_BASE = "http://localhost:8000/api/v1"  # Change to your deployed URL if needed
+# Fail fast when the backend isn't up (2s connect) while still allowing slow responses
+# (10s read); a single 10s value made every call against a down server hang for the full 10s
+TIMEOUT = httpx.Timeout(10.0, connect=2.0)
+
+# Step details go to DEBUG (shown with --verbose); failures and the summary are always shown
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
 
 async def test_supabase_tasks():
     """Test the complete task workflow with Supabase integration"""
     
-    print("🧪 Testing Supabase Task Integration...")
-    print("=" * 50)
+    logger.debug("🧪 Testing Supabase Task Integration...")
+    results = []
     
+    # One pooled client for the whole run
+    client = httpx.AsyncClient(
+        base_url=API_BASE, timeout=TIMEOUT, limits=httpx.Limits(max_keepalive_connections=10)
+    )
     try:
+        # The status check and the server-side create -> update -> delete roundtrip
+        # are independent, so issue both requests at once
+        status_response, roundtrip_response = await asyncio.gather(
+            client.get("/status"), client.post("/tasks/roundtrip-test")
+        )
+        
         # Test 1: Check system status
-        print("\n1️⃣ Checking system status...")
-        response = requests.get(f"{API_BASE}/status", timeout=10)
+        response = status_response
+        results.append(("system status", response.status_code == 200))
         
         if response.status_code == 200:
-            status = response.json()
-            print(f"✅ System Status: {status.get('status')}")
-            print(f"📊 Current tasks in system: {status.get('data_counts', {}).get('tasks', 0)}")
-            
-            ai_services = status.get('ai_services', {})
-            print(f"🤖 Supabase: {'✅' if ai_services.get('supabase') else '❌'}")
+            if logger.isEnabledFor(logging.DEBUG):
+                status = orjson.loads(response.content)
+                logger.debug("✅ System Status: %s", status.get('status'))
+                logger.debug("📊 Current tasks in system: %s", status.get('data_counts', {}).get('tasks', 0))
+                logger.debug("🤖 Supabase: %s", '✅' if status.get('ai_services', {}).get('supabase') else '❌')
         else:
-            print(f"❌ Status check failed: {response.status_code}")
-            
-        # Test 2: Get current tasks
-        print("\n2️⃣ Fetching existing tasks...")
-        response = requests.get(f"{API_BASE}/tasks", timeout=10)
+            logger.error("❌ Status check failed: %s", response.status_code)
         
+        # Tests 2-4: Create, update and delete a task in one server-side roundtrip
+        response = roundtrip_response
         if response.status_code == 200:
-            result = response.json()
-            print(f"✅ Tasks retrieved successfully")
-            print(f"📋 Source: {result.get('source', 'unknown')}")
-            print(f"📊 Count: {result.get('count', 0)} tasks")
-            
-            if result.get('tasks'):
-                print(f"📄 Sample task: {result['tasks'][0].get('summary', 'No summary')[:50]}...")
+            report = orjson.loads(response.content)
+            for step, ok in report.get('steps', {}).items():
+                results.append((f"{step} task", ok))
+            logger.debug("✅ Roundtrip on %s for task %s: %s",
+                         report.get('source', 'unknown'), report.get('task_id'), report.get('timings'))
+            if not report.get('status_ok'):
+                logger.error("❌ Task roundtrip failed: %s", report.get('steps'))
+        elif response.status_code == 404:
+            # The roundtrip endpoint is only served when the backend runs with DEBUG enabled
+            results.append(("task roundtrip", False))
+            logger.error("❌ Task roundtrip endpoint unavailable - start the backend with DEBUG=true")
         else:
-            print(f"❌ Get tasks failed: {response.status_code}")
-            
-        # Test 3: Create a new test task
-        print("\n3️⃣ Creating test task...")
-        test_task = {
-            "title": f"Test Task - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            "description": "This is a test task created by the Supabase integration test",
-            "category": "testing",
-            "priority": "medium",
-            "status": "pending"
-        }
+            results.append(("task roundtrip", False))
+            logger.error("❌ Task roundtrip request failed: %s %s", response.status_code, response.text)
         
-        response = requests.post(
-            f"{API_BASE}/tasks",
-            json=test_task,
-            headers={"Content-Type": "application/json"},
-            timeout=10
-        )
+        # Test 5: Final status check
+        response = await client.get("/tasks")
+        results.append(("final check", response.status_code == 200))
         
         if response.status_code == 200:
-            result = response.json()
-            created_task = result.get('task', {})
-            task_id = created_task.get('id')
-            print(f"✅ Task created successfully!")
-            print(f"🆔 Task ID: {task_id}")
-            print(f"📍 Source: {result.get('source', 'unknown')}")
-            print(f"📝 Title: {created_task.get('title', 'No title')}")
+            result = orjson.loads(response.content)
+            source = result.get('source', 'unknown')
+            logger.debug("✅ Final task count: %s", result.get('count', 0))
             
-            # Test 4: Update the task
-            if task_id:
-                print(f"\n4️⃣ Updating task {task_id}...")
-                update_response = requests.put(
-                    f"{API_BASE}/tasks/{task_id}",
-                    json={"status": "completed", "priority": "high"},
-                    headers={"Content-Type": "application/json"},
-                    timeout=10
-                )
-                
-                if update_response.status_code == 200:
-                    update_result = update_response.json()
-                    print(f"✅ Task updated successfully!")
-                    print(f"📍 Source: {update_result.get('source', 'unknown')}")
-                else:
-                    print(f"❌ Task update failed: {update_response.status_code}")
-                    print(f"Error: {update_response.text}")
-                
-                # Test 5: Delete the test task
-                print(f"\n5️⃣ Cleaning up test task {task_id}...")
-                delete_response = requests.delete(
-                    f"{API_BASE}/tasks/{task_id}",
-                    timeout=10
-                )
-                
-                if delete_response.status_code == 200:
-                    delete_result = delete_response.json()
-                    print(f"✅ Test task deleted successfully!")
-                    print(f"📍 Source: {delete_result.get('source', 'unknown')}")
-                else:
-                    print(f"❌ Task deletion failed: {delete_response.status_code}")
-                    print(f"Error: {delete_response.text}")
+            if source == 'memory':
+                logger.warning("⚠️ Using memory storage - Supabase not connected")
+            elif source != 'supabase':
+                logger.info("ℹ️ Using %s storage", source)
         else:
-            print(f"❌ Task creation failed: {response.status_code}")
-            print(f"Error: {response.text}")
-            
-        # Test 6: Final status check
-        print("\n6️⃣ Final system check...")
-        response = requests.get(f"{API_BASE}/tasks", timeout=10)
-        
-        if response.status_code == 200:
-            result = response.json()
-            print(f"✅ Final task count: {result.get('count', 0)}")
-            print(f"📍 Database source: {result.get('source', 'unknown')}")
-            
-            if result.get('source') == 'supabase':
-                print("🎉 SUPABASE INTEGRATION IS WORKING CORRECTLY!")
-            elif result.get('source') == 'memory':
-                print("⚠️ Using memory storage - Supabase not connected")
-            else:
-                print(f"ℹ️ Using {result.get('source')} storage")
-        
-        print("\n" + "=" * 50)
-        print("✅ Supabase task integration test completed!")
-        
+            logger.error("❌ Final task check failed: %s", response.status_code)
+    
     except Exception as e:
-        print(f"❌ Test failed with error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        # Full traceback only with --verbose
+        logger.error("❌ Test failed with error: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return False
+    finally:
+        await client.aclose()
     
-    return True
+    passed = sum(1 for _, ok in results if ok)
+    failed = [name for name, ok in results if not ok]
+    logger.info("Supabase task integration: %d/%d checks passed%s",
+                passed, len(results), f" (failed: {', '.join(failed)})" if failed else "")
+    return not failed
 
 if __name__ == "__main__":
-    print("🚀 Starting Supabase Task Integration Test")
-    print("Make sure your backend server is running!")
-    print()
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--verbose", action="store_true", help="show step details and failure tracebacks")
+    if parser.parse_args().verbose:
+        logger.setLevel(logging.DEBUG)
+    
+    logger.info("🚀 Starting Supabase Task Integration Test (make sure your backend server is running)")
     
-    asyncio.run(test_supabase_tasks()) 
\ No newline at end of file
+    asyncio.run(test_supabase_tasks())
@@ -0,0 +1,18 @@
+import pytest
+import sys
+sys.path.append('..')
+from fastapi.testclient import TestClient
+
+from main import app
+from services.ai import AIService
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient (and one app startup/shutdown) for the whole test session"""
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture(scope="session")
+def ai_service():
+    """Shared AIService; constructing it has no per-test state"""
+    return AIService()
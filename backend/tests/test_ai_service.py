@@ -0,0 +1,17 @@
+import pytest
+
+class TestAIServiceIntegration:
+    """Test AI service integration and functionality"""
+    
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_ai_health_check(self, ai_service):
+        """Test AI service health check"""
+        health = await ai_service.health_check()
+        
+        assert isinstance(health, dict)
+        assert "groq" in health
+        assert "huggingface" in health
+
+if __name__ == "__main__":
+    pytest.main(["--verbose", __file__])
@@ -0,0 +1,39 @@
+import pytest
+
+class TestCriticalUserJourneys:
+    """Test critical user journeys end-to-end"""
+    
+    def test_health_check(self, client):
+        """Test basic health check endpoint"""
+        response = client.get("/ping")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ok"
+        assert "timestamp" in data
+    
+    def test_chat_basic_functionality(self, client):
+        """Test basic chat functionality"""
+        payload = {
+            "message": "Hello, can you help me create a task to buy groceries?",
+            "context": "user_testing"
+        }
+        
+        response = client.post("/api/v1/chat", json=payload)
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert "response" in data
+        assert "status" in data
+        assert "tasks" in data
+        assert isinstance(data["tasks"], list)
+    
+    def test_monitoring_health(self, client):
+        """Test monitoring health endpoint"""
+        response = client.get("/api/v1/monitoring/health")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "success"
+        assert "health" in data
+
+if __name__ == "__main__":
+    pytest.main(["--verbose", __file__])
@@ -0,0 +1,142 @@
+import asyncio
+import pytest
+
+from services.monitoring import MetricRing, APIMonitor, INTAKE_BATCH, TRACKER_POOL_SIZE, _tracker_pool
+
+class TestMonitoringSystem:
+    """Test monitoring and metrics functionality"""
+    
+    def test_monitoring_dashboard(self, client):
+        """Test monitoring dashboard endpoint"""
+        response = client.get("/api/v1/monitoring/dashboard")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["status"] == "success"
+        assert "data" in data
+
+class TestMetricRing:
+    """Time-window lookups on the metric ring buffer"""
+    
+    @staticmethod
+    def _ring(timestamps, capacity=5):
+        ring = MetricRing(capacity)
+        for ts in timestamps:
+            ring.append(ts, 0, "/chat", "POST", 200, 0.1, 0, 0, None, None)
+        return ring
+    
+    @staticmethod
+    def _since(ring, cutoff):
+        return [ring.ts[i] for lo, hi in ring.segments_since(cutoff) for i in range(lo, hi)]
+    
+    def test_empty_ring(self):
+        """An empty ring yields no rows for any cutoff"""
+        ring = MetricRing(5)
+        assert list(ring.rows_since(0.0)) == []
+        assert all(lo == hi for lo, hi in ring.segments_since(0.0))
+    
+    def test_wraparound(self):
+        """After 8 appends to 5 slots only the newest 5 remain, oldest first"""
+        ring = self._ring([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0])
+        assert len(ring) == 5
+        assert ring.segments_since(0.0) == [(3, 5), (0, 3)]
+        assert [row["response_time"] for row in ring.rows_since(0.0)] == [0.1] * 5
+        assert self._since(ring, 0.0) == [4.0, 5.0, 6.0, 7.0, 8.0]
+        
+        # Cutoffs inside the older and the newer half
+        assert self._since(ring, 4.5) == [5.0, 6.0, 7.0, 8.0]
+        assert self._since(ring, 6.5) == [7.0, 8.0]
+        assert list(ring.rows_since(9.0)) == []
+    
+    def test_cutoff_at_segment_boundary(self):
+        """Cutoffs at the first wrapped slot or the oldest kept slot split the halves exactly"""
+        ring = self._ring([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0])
+        # Slots hold [6, 7, 8, 4, 5]: the older half is 3..5, the wrapped half 0..3
+        assert self._since(ring, 6.0) == [6.0, 7.0, 8.0]
+        assert self._since(ring, 5.0) == [5.0, 6.0, 7.0, 8.0]
+        assert self._since(ring, 4.0) == [4.0, 5.0, 6.0, 7.0, 8.0]
+    
+    def test_partial_ring(self):
+        """Before the ring fills, one segment covers every slot written"""
+        ring = self._ring([1.0, 2.0, 3.0])
+        assert ring.segments_since(2.0) == [(1, 3)]
+        assert len(list(ring.rows_since(0.0))) == 3
+
+class TestTrackerPool:
+    """Reuse of finished API call trackers"""
+    
+    def test_tracker_is_reused_with_fresh_state(self):
+        """A finished tracker goes back to the pool and comes out reset for the next call"""
+        _tracker_pool.clear()
+        monitor = APIMonitor()
+        
+        with monitor.track_api_call("groq", "/chat") as first:
+            first.set_status(429, "rate limited")
+        assert _tracker_pool == [first]
+        assert first.monitor is None
+        
+        second = monitor.track_api_call("supabase", "/tasks", "GET", user_id="u1")
+        assert second is first
+        assert not _tracker_pool
+        assert second.monitor is monitor
+        assert (second.endpoint, second.method, second.user_id) == ("/tasks", "GET", "u1")
+        assert (second.status_code, second.error_message) == (200, None)
+    
+    def test_pool_is_bounded(self):
+        """Trackers beyond TRACKER_POOL_SIZE are dropped instead of pooled"""
+        _tracker_pool.clear()
+        monitor = APIMonitor()
+        trackers = [monitor.track_api_call("groq", "/chat") for _ in range(TRACKER_POOL_SIZE + 1)]
+        for tracker in trackers:
+            with tracker:
+                pass
+        assert len(_tracker_pool) == TRACKER_POOL_SIZE
+        _tracker_pool.clear()
+
+class TestIntake:
+    """Deferred recording of finished calls through the intake queue"""
+    
+    def test_flush_intake_records_queued_calls(self):
+        """Calls finished inside the event loop are queued until flushed, oldest first"""
+        async def run():
+            monitor = APIMonitor()
+            for endpoint in ("/a", "/b", "/c"):
+                with monitor.track_api_call("groq", endpoint):
+                    pass
+            assert len(monitor._intake) == 3 and len(monitor.metrics) == 0
+            
+            monitor.flush_intake(2)
+            assert len(monitor._intake) == 1 and len(monitor.metrics) == 2
+            monitor.flush_intake()
+            assert not monitor._intake
+            assert [row["endpoint"] for row in monitor.metrics.rows_since(0.0)] == ["/a", "/b", "/c"]
+            assert monitor.req[0] == 3
+        
+        asyncio.run(run())
+    
+    def test_drain_task_empties_intake(self):
+        """The background drain task records everything and then clears itself"""
+        async def run():
+            monitor = APIMonitor()
+            for _ in range(INTAKE_BATCH + 1):
+                with monitor.track_api_call("supabase", "/tasks"):
+                    pass
+            assert monitor._drain_task is not None
+            await monitor._drain_task
+            assert not monitor._intake and monitor._drain_task is None
+            assert len(monitor.metrics) == INTAKE_BATCH + 1
+        
+        asyncio.run(run())
+    
+    def test_queues_without_event_loop_until_read(self):
+        """Outside an event loop calls are only queued; the next read records them"""
+        monitor = APIMonitor()
+        with monitor.track_api_call("groq", "/chat"):
+            pass
+        assert len(monitor._intake) == 1 and len(monitor.metrics) == 0
+        
+        monitor.get_recent_response_time("groq")
+        assert not monitor._intake and len(monitor.metrics) == 1
+
+if __name__ == "__main__":
+    pytest.main(["--verbose", __file__])
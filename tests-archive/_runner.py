@@ -0,0 +1,25 @@
+"""
+Shared entry point for the async test scripts
+"""
+
+import asyncio
+import io
+import sys
+from contextlib import redirect_stdout
+
+def run(main_coro):
+    """Run main_coro to completion and return its result.
+    Uses the libuv event loop when uvloop is installed (it ships with uvicorn[standard]),
+    and writes the report in one go instead of flushing after every print() line."""
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+    buf = io.StringIO()
+    try:
+        with redirect_stdout(buf):
+            return asyncio.run(main_coro)
+    finally:
+        sys.stdout.write(buf.getvalue())
@@ -0,0 +1,24 @@
+"""
+Shared Supabase client for the test scripts
+"""
+
+import os
+from functools import lru_cache
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+# Credentials may live in the working directory's .env or the backend's
+load_dotenv()
+load_dotenv('backend/.env')
+
+PLACEHOLDER_URL = "https://your-project-id.supabase.co"
+
+@lru_cache(maxsize=1)
+def get_client() -> Client:
+    """Create the Supabase client once; scripts run in one session share it.
+    Raises KeyError for missing credentials and ValueError for the placeholder URL."""
+    url = os.environ["SUPABASE_URL"]
+    key = os.environ["SUPABASE_ANON_KEY"]
+    if url == PLACEHOLDER_URL:
+        raise ValueError("SUPABASE_URL is still the placeholder")
+    return create_client(url, key)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Run the PostgreSQL, task retrieval and Supabase connection tests together
+All three share one event loop, one initialized database service and one HTTP client,
+so connections are set up once instead of once per script
+"""
+
+import os
+import sys
+
+# The scripts import the service both as services.* and backend.services.*; put both
+# roots on the path and alias the package so they get the same database_service
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, 'backend'), ROOT]
+
+from dotenv import load_dotenv
+load_dotenv(os.path.join(ROOT, 'backend', '.env'))
+
+import config
+import services
+import services.postgres_db
+from services.postgres_db import database_service
+sys.modules.update({
+    'backend.config': config,
+    'backend.config.settings': sys.modules['config.settings'],
+    'backend.services': services,
+    'backend.services.postgres_db': services.postgres_db,
+})
+
+from test_postgresql_connection import test_postgresql_connection
+from test_task_retrieval import test_task_operations
+from test_supabase_connection import make_client, test_supabase_connection
+from _runner import run
+
+async def _run_test(name, test):
+    """Await one test coroutine; an exception counts as a failure instead of ending the run"""
+    try:
+        return bool(await test)
+    except Exception as e:
+        print(f"\n💥 {name} test failed with error: {e}")
+        return False
+
+async def main():
+    """Run each test in turn on the shared connections"""
+    print("🚀 Running database test suite\n")
+    
+    await database_service.initialize_connections()
+    results = {}
+    try:
+        results['postgresql'] = await _run_test("PostgreSQL", test_postgresql_connection())
+        print()
+        results['task retrieval'] = await _run_test("Task retrieval", test_task_operations())
+        print()
+        async with make_client() as client:
+            results['supabase'] = await _run_test("Supabase", test_supabase_connection(client))
+    finally:
+        await database_service.close()
+    
+    print("\n" + "=" * 50)
+    for name, ok in results.items():
+        print(f"{'✅' if ok else '❌'} {name}")
+
+if __name__ == "__main__":
+    run(main())
@@ -7,28 +7,51 @@ Tests image processing, voice transcription, and multimodal chat functionality
 import asyncio
 import httpx
 import json
+import orjson
 import os
 import sys
+import tempfile
 import time
+from contextlib import nullcontext
 from pathlib import Path
 
-async def test_multimodal_endpoints():
-    """Test multimodal API endpoints"""
+# Keep-alive pool shared by every request in the suite
+CLIENT_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+def make_client() -> httpx.AsyncClient:
+    """Pooled client for the multimodal tests"""
+    return httpx.AsyncClient(timeout=60.0, limits=CLIENT_LIMITS)
+
+def _result(response):
+    """Unwrap a gathered response, re-raising its exception in the caller's try block"""
+    if isinstance(response, Exception):
+        raise response
+    return response
+
+async def test_multimodal_endpoints(client: httpx.AsyncClient = None):
+    """Test multimodal API endpoints (pass a client to share its connections with other scripts)"""
     print("🎯 Testing IntelliAssist.AI Multimodal Features")
     print("=" * 60)
     
     base_url = "http://localhost:8000"
     
-    async with httpx.AsyncClient(timeout=60.0) as client:
+    # A caller's client stays open for reuse; otherwise open (and close) our own
+    async with (nullcontext(client) if client else make_client()) as client:
+        
+        # The health and documentation GETs don't depend on anything, so fetch them all at once
+        ping, ai_health, docs, openapi = await asyncio.gather(
+            *[client.get(f"{base_url}{path}") for path in ("/ping", "/api/v1/ai/health", "/docs", "/openapi.json")],
+            return_exceptions=True
+        )
         
         # Test 1: Basic Health Checks
         print("1️⃣ Testing Health Endpoints...")
         try:
-            response = await client.get(f"{base_url}/ping")
-            print(f"   /ping: {response.status_code} - {response.json()}")
+            response = _result(ping)
+            print(f"   /ping: {response.status_code} - {orjson.loads(response.content)}")
             
-            response = await client.get(f"{base_url}/api/v1/ai/health")
-            health = response.json()
+            response = _result(ai_health)
+            health = orjson.loads(response.content)
             print(f"   AI Health: {health['ai_services']['groq_status']}")
         except Exception as e:
             print(f"   ❌ Health check failed: {e}")
@@ -47,7 +70,7 @@ async def test_multimodal_endpoints():
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 print(f"   ✅ Status: {data['status']}")
                 print(f"   📊 Response Time: {data['response_time']}s")
                 print(f"   💬 Response: {data['response'][:100]}...")
@@ -60,18 +83,22 @@ async def test_multimodal_endpoints():
         # Test 3: File Upload
         print("\n3️⃣ Testing File Upload...")
         try:
-            # Create a simple test image (this would normally be a real image file)
-            test_image_content = b"fake_image_data_for_testing"
-            
-            files = {"file": ("test_image.jpg", test_image_content, "image/jpeg")}
-            
-            response = await client.post(
-                f"{base_url}/api/v1/upload",
-                files=files
-            )
+            # Create a simple test image (this would normally be a real image file).
+            # Uploading from a file handle lets httpx stream the body in chunks
+            # instead of holding the whole payload in memory.
+            with tempfile.NamedTemporaryFile(suffix=".jpg") as tmp:
+                tmp.write(b"fake_image_data_for_testing")
+                tmp.flush()
+                tmp.seek(0)
+                files = {"file": ("test_image.jpg", tmp, "image/jpeg")}
+                
+                response = await client.post(
+                    f"{base_url}/api/v1/upload",
+                    files=files
+                )
             
             if response.status_code == 200:
-                upload_result = response.json()
+                upload_result = orjson.loads(response.content)
                 print(f"   ✅ Upload successful: {upload_result['filename']}")
                 print(f"   📁 File ID: {upload_result['file_id']}")
                 
@@ -96,19 +123,27 @@ async def test_multimodal_endpoints():
                 "task_type": "general"
             }
             
-            response = await client.post(
-                f"{base_url}/api/v1/multimodal",
-                json=multimodal_data
-            )
+            # Stream the body so time-to-first-byte is visible and chunks are
+            # appended to one buffer as they arrive
+            sent = time.perf_counter()
+            first_byte = None
+            body = bytearray()
+            async with client.stream("POST", f"{base_url}/api/v1/multimodal", json=multimodal_data) as response:
+                async for chunk in response.aiter_bytes():
+                    if first_byte is None:
+                        first_byte = time.perf_counter() - sent
+                    body += chunk
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(body)
                 print(f"   ✅ Status: {data['status']}")
+                if first_byte is not None:
+                    print(f"   ⏱️  First byte after: {first_byte:.2f}s")
                 print(f"   📊 Processing Time: {data['processing_details']['processing_time']}s")
                 print(f"   🔧 Inputs Processed: {', '.join(data['inputs_processed'])}")
                 print(f"   💬 Response: {data['response'][:150]}...")
             else:
-                error_data = response.json()
+                error_data = orjson.loads(body)
                 print(f"   ⚠️  Status: {response.status_code}")
                 print(f"   Error: {error_data.get('detail', {}).get('message', 'Unknown error')}")
                 
@@ -154,15 +189,15 @@ async def test_multimodal_endpoints():
         # Test 6: API Documentation
         print("\n6️⃣ Testing API Documentation...")
         try:
-            response = await client.get(f"{base_url}/docs")
+            response = _result(docs)
             if response.status_code == 200:
                 print("   ✅ API documentation accessible")
             else:
                 print(f"   ⚠️  Docs status: {response.status_code}")
                 
-            response = await client.get(f"{base_url}/openapi.json")
+            response = _result(openapi)
             if response.status_code == 200:
-                openapi_spec = response.json()
+                openapi_spec = orjson.loads(response.content)
                 endpoints = list(openapi_spec.get("paths", {}).keys())
                 print(f"   📋 Available endpoints: {len(endpoints)}")
                 print(f"       {', '.join(endpoints)}")
@@ -1,86 +1,98 @@
 #!/usr/bin/env python3
 
-import asyncio
-import requests
-import json
+import httpx
+import orjson
+from contextlib import nullcontext
+from _runner import run
 
-async def test_supabase_connection():
-    """Test the Supabase database connection"""
-    
-    base_url = "http://localhost:8000/api/v1"
+BASE_URL = "http://localhost:8000/api/v1"
+
+def make_client():
+    """Pooled client for the API calls below"""
+    return httpx.AsyncClient(
+        base_url=BASE_URL, timeout=10.0, limits=httpx.Limits(max_keepalive_connections=10)
+    )
+
+async def test_supabase_connection(client=None):
+    """Test the Supabase database connection (pass a client to share its pool); returns success"""
     
     print("🔗 Testing Supabase Connection...")
     
     try:
-        # Test database health endpoint
-        response = requests.get(f"{base_url}/database/health", timeout=10)
+        async with nullcontext(client) if client else make_client() as client:
+            return await _run_checks(client)
+    except Exception as e:
+        print(f"❌ Error testing Supabase connection: {e}")
+        print("💡 Make sure the backend server is running on port 8000")
+        return False
+
+async def _run_checks(client):
+    """Health check, then create a task and confirm it is listed; returns whether it was"""
+    test_task_found = False
+    
+    # Test database health endpoint
+    response = await client.get("/database/health")
+    
+    if response.status_code == 200:
+        result = orjson.loads(response.content)
+        database_status = result.get('database', {})
+        status = database_status.get('status', 'unknown')
         
-        if response.status_code == 200:
-            result = response.json()
-            database_status = result.get('database', {})
-            status = database_status.get('status', 'unknown')
+        print(f"✅ Database health check: {status}")
+        
+        if status in ['connected', 'development_mode']:
+            if status == 'development_mode':
+                print("🛠️ Running in development mode with in-memory storage!")
+                print(f"📊 Current tasks in memory: {database_status.get('tasks_count', 0)}")
+            else:
+                print("🎉 Supabase connection is working!")
             
-            print(f"✅ Database health check: {status}")
+            # Test creating a task directly via API
+            print("\n📝 Testing direct task creation...")
             
-            if status in ['connected', 'development_mode']:
-                if status == 'development_mode':
-                    print("🛠️ Running in development mode with in-memory storage!")
-                    print(f"📊 Current tasks in memory: {database_status.get('tasks_count', 0)}")
-                else:
-                    print("🎉 Supabase connection is working!")
-                
-                # Test creating a task directly via API
-                print("\n📝 Testing direct task creation...")
-                
-                test_task = {
-                    "summary": "Test task from Python script",
-                    "category": "testing",
-                    "priority": "low",
-                    "status": "pending"
-                }
-                
-                create_response = requests.post(
-                    f"{base_url}/tasks",
-                    json=test_task,
-                    timeout=10
-                )
+            test_task = {
+                "summary": "Test task from Python script",
+                "category": "testing",
+                "priority": "low",
+                "status": "pending"
+            }
+            
+            create_response = await client.post("/tasks", json=test_task)
+            
+            if create_response.status_code == 200:
+                created_task = orjson.loads(create_response.content)
+                print(f"✅ Task created successfully: ID {created_task.get('id')}")
                 
-                if create_response.status_code == 200:
-                    created_task = create_response.json()
-                    print(f"✅ Task created successfully: ID {created_task.get('id')}")
-                    
-                    # Verify task was saved
-                    tasks_response = requests.get(f"{base_url}/tasks", timeout=10)
-                    if tasks_response.status_code == 200:
-                        tasks_result = tasks_response.json()
-                        print(f"📊 Total tasks now: {tasks_result.get('count', 0)}")
-                        
-                        # Find our test task
-                        test_task_found = any(
-                            task.get('summary') == test_task['summary'] 
-                            for task in tasks_result.get('tasks', [])
-                        )
-                        
-                        if test_task_found:
-                            print("✅ Test task found in database!")
-                        else:
-                            print("⚠️ Test task not found in database")
+                # Verify task was saved
+                tasks_response = await client.get("/tasks")
+                if tasks_response.status_code == 200:
+                    tasks_result = orjson.loads(tasks_response.content)
+                    print(f"📊 Total tasks now: {tasks_result.get('count', 0)}")
                     
-                else:
-                    print(f"❌ Task creation failed: {create_response.status_code}")
-                    print(f"Error: {create_response.text}")
+                    # Find our test task
+                    test_task_found = any(
+                        task.get('summary') == test_task['summary'] 
+                        for task in tasks_result.get('tasks', [])
+                    )
                     
+                    if test_task_found:
+                        print("✅ Test task found in database!")
+                    else:
+                        print("⚠️ Test task not found in database")
+                
             else:
-                print(f"⚠️ Database status: {status}")
-                print("💡 Check your Supabase configuration in .env file")
+                print(f"❌ Task creation failed: {create_response.status_code}")
+                print(f"Error: {create_response.text}")
                 
         else:
-            print(f"❌ Database health check failed: {response.status_code}")
-            print(f"Error: {response.text}")
+            print(f"⚠️ Database status: {status}")
+            print("💡 Check your Supabase configuration in .env file")
             
-    except Exception as e:
-        print(f"❌ Error testing Supabase connection: {e}")
-        print("💡 Make sure the backend server is running on port 8000")
+    else:
+        print(f"❌ Database health check failed: {response.status_code}")
+        print(f"Error: {response.text}")
+    
+    return test_task_found
 
 if __name__ == "__main__":
-    asyncio.run(test_supabase_connection()) 
\ No newline at end of file
+    run(test_supabase_connection())
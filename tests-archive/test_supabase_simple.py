@@ -3,51 +3,20 @@
 Simple Supabase Task Creation Test
 """
 
-import os
-import sys
-from dotenv import load_dotenv
-
-# Load environment variables from the backend directory
-load_dotenv('backend/.env')
-
-# Add backend to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
-
-try:
-    from supabase import create_client, Client
-    SUPABASE_AVAILABLE = True
-except ImportError:
-    SUPABASE_AVAILABLE = False
+from _supabase import get_client
 
 def test_supabase_task_creation():
     """Test Supabase task creation directly"""
     print("🧪 Testing Supabase Task Creation...")
     
-    if not SUPABASE_AVAILABLE:
-        print("❌ Supabase client not available")
-        return False
-    
-    # Get credentials
-    supabase_url = os.getenv('SUPABASE_URL')
-    supabase_anon_key = os.getenv('SUPABASE_ANON_KEY')
-    
-    print(f"SUPABASE_URL: {'✅' if supabase_url else '❌'}")
-    print(f"SUPABASE_ANON_KEY: {'✅' if supabase_anon_key else '❌'}")
-    
-    if supabase_url:
-        print(f"URL starts with: {supabase_url[:30]}...")
-    if supabase_anon_key:
-        print(f"Key starts with: {supabase_anon_key[:20]}...")
-    
-    if not supabase_url or not supabase_anon_key:
-        print("❌ Missing Supabase credentials")
+    try:
+        supabase = get_client()
+        print("✅ Supabase client created")
+    except (KeyError, ValueError) as e:
+        print(f"❌ Missing or placeholder Supabase credentials: {e}")
         return False
     
     try:
-        # Create client
-        supabase: Client = create_client(supabase_url, supabase_anon_key)
-        print("✅ Supabase client created")
-        
         # Test simple task creation with only required fields
         test_task = {
             "summary": "Test task from direct script - UUID fix!",
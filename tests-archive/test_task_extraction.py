@@ -1,10 +1,24 @@
 #!/usr/bin/env python3
 
-import requests
+import asyncio
+import httpx
 import json
 import time
 
-def test_task_extraction():
+async def _capture(request):
+    """Await a request, returning its exception instead of raising it"""
+    try:
+        return await request
+    except Exception as e:
+        return e
+
+def _result(response):
+    """Unwrap a captured response, re-raising its exception in the caller's try block"""
+    if isinstance(response, Exception):
+        raise response
+    return response
+
+async def test_task_extraction():
     """Test the task extraction functionality"""
     
     base_url = "http://localhost:8000/api/v1"
@@ -23,13 +37,18 @@ Can you help me organize these tasks?"""
     print("🧠 Testing AI Task Extraction...")
     print(f"📝 Test message: {test_message[:100]}...")
     
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        # The chat request and a baseline task listing don't depend on each other
+        chat_response, before_response = await asyncio.gather(
+            _capture(client.post("/chat", json={"message": test_message}, timeout=30)),
+            _capture(client.get("/tasks", timeout=10))
+        )
+        # Listing again afterwards shows what the chat saved
+        after_response = await _capture(client.get("/tasks", timeout=10))
+    
     try:
         # Test chat endpoint
-        response = requests.post(
-            f"{base_url}/chat",
-            json={"message": test_message},
-            timeout=30
-        )
+        response = _result(chat_response)
         
         if response.status_code == 200:
             result = response.json()
@@ -60,11 +79,13 @@ Can you help me organize these tasks?"""
     # Test tasks endpoint
     print(f"\n📋 Testing Tasks Endpoint...")
     try:
-        response = requests.get(f"{base_url}/tasks", timeout=10)
+        response = _result(after_response)
         if response.status_code == 200:
             result = response.json()
             print(f"✅ Tasks endpoint working")
             print(f"📊 Total tasks in database: {result.get('count', 0)}")
+            if not isinstance(before_response, Exception) and before_response.status_code == 200:
+                print(f"🆕 Saved by this chat: {result.get('count', 0) - before_response.json().get('count', 0)}")
             
             if result.get('tasks'):
                 print("\n💾 Saved Tasks:")
@@ -79,4 +100,4 @@ Can you help me organize these tasks?"""
         print(f"❌ Error testing tasks endpoint: {e}")
 
 if __name__ == "__main__":
-    test_task_extraction() 
\ No newline at end of file
+    asyncio.run(test_task_extraction()) 
\ No newline at end of file
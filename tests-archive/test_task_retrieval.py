@@ -7,6 +7,7 @@ import os
 import sys
 import asyncio
 from dotenv import load_dotenv
+from _runner import run
 
 # Load environment variables
 load_dotenv('backend/.env')
@@ -21,12 +22,9 @@ async def test_task_operations():
     try:
         from services.postgres_db import database_service
         
-        # Test database health
-        health = await database_service.health_check()
-        print(f"Database Health: {health}")
+        # Connect before the concurrent calls below; data methods assume a ready service
+        await database_service.initialize_connections()
         
-        # Test task creation
-        print("\n📝 Testing Task Creation...")
         test_task = {
             "summary": "Test task from debug script",
             "category": "testing",
@@ -35,7 +33,14 @@ async def test_task_operations():
             "user_id": None
         }
         
-        created_task = await database_service.create_task(test_task)
+        # The health check doesn't depend on the insert, so run both together
+        health, created_task = await asyncio.gather(
+            database_service.health_check(), database_service.create_task(test_task)
+        )
+        print(f"Database Health: {health}")
+        
+        # Test task creation
+        print("\n📝 Testing Task Creation...")
         if created_task:
             print(f"✅ Task created: {created_task}")
         else:
@@ -56,7 +61,11 @@ async def test_task_operations():
         traceback.print_exc()
         return False
 
-if __name__ == "__main__":
+async def main():
+    """Run the task test and report the outcome"""
     print("🚀 Starting Task Retrieval Test\n")
-    success = asyncio.run(test_task_operations())
-    print(f"\n{'✅ Test passed!' if success else '❌ Test failed!'}") 
\ No newline at end of file
+    success = await test_task_operations()
+    print(f"\n{'✅ Test passed!' if success else '❌ Test failed!'}")
+
+if __name__ == "__main__":
+    run(main())